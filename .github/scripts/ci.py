@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# ci.py - Entry point for the CI/CD helper scripts (see ci_tools/cli.py)
+
+import sys
+
+from ci_tools.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# ci_tools - CI/CD helper scripts for FootballHero
+#
+# Subcommands are imported only when they run, so importing the package (or
+# starting the shared CLI) stays cheap. See cli.py for the entry point.
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# cli.py - Shared entry point for the CI/CD helper scripts
+#
+#   python .github/scripts/ci.py <command> [options]
+#
+# Only the module behind the selected command is imported, and heavy
+# dependencies (pandas, matplotlib, jinja2) are imported inside the functions
+# that need them, so commands on the critical path start quickly.
+
+import sys
+
+COMMANDS = {
+    'test': ('ci_tools.test_helper', 'Select and run Flutter tests'),
+    'metrics': ('ci_tools.metrics_collector', 'Collect CI/CD metrics and generate reports'),
+    'dashboard': ('ci_tools.generate_dashboard', 'Generate the CI/CD dashboard'),
+    'fixtures': ('ci_tools.dashboard_fixtures', 'Replay, serve or generate offline dashboard data'),
+    'status': ('ci_tools.status_check', 'Show the latest run of every workflow'),
+    'flaky': ('ci_tools.flaky_tests', 'Record test outcomes and report flaky tests')
+}
+
+def print_usage(stream=sys.stdout):
+    print("usage: ci.py [--profile-startup] <command> [options]\n", file=stream)
+    print("commands:", file=stream)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<10} {description}", file=stream)
+    print("\n  --profile-startup  report import times for the command instead of running it", file=stream)
+
+def profile_startup(module_name, top=20):
+    """
+    Import a command module in a fresh interpreter with -X importtime and
+    print the slowest imports by cumulative time
+    """
+    import os
+    import subprocess
+
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        print(f"Error importing {module_name}:\n{result.stderr}")
+        return 1
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        imports.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    total = next((cumulative for cumulative, _, name in imports if name.strip() == module_name), 0)
+    print(f"Startup import time for {module_name}: {total / 1000:.1f} ms\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in sorted(imports, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+    return 0
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    profile = '--profile-startup' in argv
+    if profile:
+        argv.remove('--profile-startup')
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0 if argv else 1
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 1
+
+    module_name = COMMANDS[command][0]
+    if profile:
+        return profile_startup(module_name)
+
+    import importlib
+    module = importlib.import_module(module_name)
+    return module.main(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
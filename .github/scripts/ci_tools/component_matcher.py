@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# component_matcher.py - Map repository paths to the components of the CI component map
+#
+# Used both to select tests for changed files and to group coverage by
+# component, so a path pattern means the same thing in both places.
+
+import re
+
+GLOB_CHARS = set('*?[')
+# Trie node keys; path segments are strings, so these can never collide with them
+SUBTREE_KEY = 0
+EXACT_KEY = 1
+REGEX_KEY = 2
+
+def glob_to_regex(pattern):
+    """
+    Translate a path glob into a regex.
+
+    '**' matches across directories, '*', '?' and '[...]' character classes
+    ('[!...]' negated) stay within one path segment. A '[' without a closing
+    ']' is a literal.
+    """
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            regex.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            start = i + 1
+            if start < len(pattern) and pattern[start] in '!^':
+                start += 1
+            # A ']' right after the opening bracket is part of the class
+            end = pattern.find(']', start + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                members = ''.join('\\' + c if c in '\\[]^' else c for c in pattern[start:end])
+                negated = start > i + 1
+                regex.append(f"[^/{members}]" if negated else f"(?!/)[{members}]")
+                i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+
+    return re.compile(''.join(regex) + r'\Z')
+
+class ComponentMatcher:
+    """
+    Precompiled path-to-component matcher built from the component map.
+
+    Literal paths and 'dir/**' globs (or 'dir/') live in a path-segment trie.
+    Other globs are compiled to regexes and hung off the trie node of their
+    literal prefix, so a lookup only walks the file's own path.
+    """
+
+    def __init__(self, component_map):
+        self.critical_files = set(component_map.get('critical_files', []))
+        self.tests = {}
+        self.trie = {}
+
+        for component, info in component_map.get('components', {}).items():
+            self.tests[component] = info.get('tests', [])
+            for path in info.get('paths', []):
+                self._add_pattern(path, component)
+
+    def _node(self, segments):
+        node = self.trie
+        for segment in segments:
+            node = node.setdefault(segment, {})
+        return node
+
+    def _add_pattern(self, pattern, component):
+        if pattern.endswith('/'):
+            pattern += '**'
+        segments = pattern.strip('/').split('/')
+
+        if segments[-1] == '**' and not any(GLOB_CHARS & set(s) for s in segments[:-1]):
+            # Whole directory: every file below the node belongs to the component
+            self._node(segments[:-1]).setdefault(SUBTREE_KEY, set()).add(component)
+            return
+
+        if not any(GLOB_CHARS & set(s) for s in segments):
+            self._node(segments).setdefault(EXACT_KEY, set()).add(component)
+            return
+
+        literal = []
+        for segment in segments:
+            if GLOB_CHARS & set(segment):
+                break
+            literal.append(segment)
+        self._node(literal).setdefault(REGEX_KEY, []).append((glob_to_regex(pattern.strip('/')), component))
+
+    def match(self, path):
+        """Return the set of components that own the given file"""
+        components = set()
+        segments = path.split('/')
+        node = self.trie
+
+        for segment in segments:
+            components.update(node.get(SUBTREE_KEY, ()))
+            for regex, component in node.get(REGEX_KEY, ()):
+                if regex.match(path):
+                    components.add(component)
+
+            node = node.get(segment)
+            if node is None:
+                return components
+
+        components.update(node.get(EXACT_KEY, ()))
+        for regex, component in node.get(REGEX_KEY, ()):
+            if regex.match(path):
+                components.add(component)
+
+        return components
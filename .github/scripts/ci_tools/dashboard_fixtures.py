@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# dashboard_fixtures.py - Offline data sources for the CI/CD dashboard
+#
+# Replays recorded GitHub API data (workflows, workflow runs, pull requests)
+# from JSON/NDJSON dumps, serves it through a local stand-in for the REST API
+# and the pull request GraphQL query, and generates synthetic histories for
+# benchmarking generate_dashboard.py.
+
+import os
+import sys
+import json
+import bisect
+import random
+import argparse
+import datetime
+
+FIXTURE_KINDS = {
+    'workflows': 'workflows',
+    'runs': 'workflow_runs',
+    'jobs': 'jobs',
+    'pulls': None
+}
+
+def read_fixture(fixture_dir, kind):
+    """
+    Read the records of one kind from <kind>.ndjson or <kind>.json.
+
+    JSON files may hold a plain list or an API envelope such as
+    {"workflow_runs": [...]}.
+    """
+    ndjson_path = os.path.join(fixture_dir, f'{kind}.ndjson')
+    json_path = os.path.join(fixture_dir, f'{kind}.json')
+
+    if os.path.exists(ndjson_path):
+        with open(ndjson_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    if os.path.exists(json_path):
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data.get(FIXTURE_KINDS[kind] or kind, [])
+        return data
+
+    return []
+
+def write_fixture(fixture_dir, kind, records):
+    """Write records of one kind as NDJSON"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(os.path.join(fixture_dir, f'{kind}.ndjson'), 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+class FixtureSource:
+    """
+    Data source backed by recorded fixtures instead of the GitHub API.
+
+    Exposes the same list_workflows/list_runs/get_run/list_jobs/
+    list_pull_requests interface as the live GitHubClient in
+    generate_dashboard.py.
+    """
+
+    def __init__(self, fixture_dir, repo_name='fixtures/replay'):
+        self.repo_name = repo_name
+        self.runs_by_id = {}
+        runs_by_workflow = {}
+
+        for run in read_fixture(fixture_dir, 'runs'):
+            self.runs_by_id[run['id']] = run
+            runs_by_workflow.setdefault(run.get('workflow_id'), []).append(run)
+
+        # Newest first, like the API; keys kept ascending for bisect
+        self.runs_by_workflow = {}
+        for workflow_id, runs in runs_by_workflow.items():
+            runs.sort(key=lambda run: run['created_at'])
+            self.runs_by_workflow[workflow_id] = ([run['created_at'] for run in runs], runs)
+
+        self.workflows = read_fixture(fixture_dir, 'workflows')
+        if not self.workflows:
+            # Recorded runs carry their workflow id and name
+            names = {}
+            for run in self.runs_by_id.values():
+                names.setdefault(run.get('workflow_id'), run.get('name'))
+            self.workflows = [
+                {'id': workflow_id, 'name': name, 'state': 'active'}
+                for workflow_id, name in sorted(names.items(), key=lambda item: str(item[0]))
+            ]
+
+        self.jobs_by_run = {}
+        for job in read_fixture(fixture_dir, 'jobs'):
+            self.jobs_by_run.setdefault(job.get('run_id'), []).append(job)
+
+        self.pulls = read_fixture(fixture_dir, 'pulls')
+
+    def list_workflows(self):
+        return list(self.workflows)
+
+    def list_runs(self, workflow, start=None, max_runs=None, end=None):
+        """Runs of a workflow created at or after start and before end, newest first"""
+        keys, runs = self.runs_by_workflow.get(workflow['id'], ([], []))
+        first = bisect.bisect_left(keys, start) if start else 0
+        last = bisect.bisect_left(keys, end) if end else len(runs)
+        selected = runs[first:last][::-1]
+        return selected[:max_runs] if max_runs else selected
+
+    def get_run(self, run_id):
+        return self.runs_by_id[run_id]
+
+    def list_jobs(self, run_id):
+        return list(self.jobs_by_run.get(run_id, []))
+
+    def list_recent_runs(self, branch=None):
+        """Runs of all workflows, newest first, optionally on one branch"""
+        runs = sorted(self.runs_by_id.values(), key=lambda run: run['created_at'], reverse=True)
+        return [run for run in runs if run.get('head_branch') == branch] if branch else runs
+
+    def find_workflow(self, workflow_id):
+        """Look a workflow up by numeric id or by file name, like the API does"""
+        if workflow_id.isdigit():
+            return {'id': int(workflow_id)}
+        for workflow in self.workflows:
+            if os.path.basename(workflow.get('path') or '') == workflow_id:
+                return workflow
+        raise KeyError(workflow_id)
+
+    def list_pull_requests(self, updated_after=None, states=None):
+        """Normalized pull request records, most recently updated first"""
+        pulls = sorted(
+            (normalize_rest_pull(pull) for pull in self.pulls),
+            key=lambda pull: pull['updated_at'], reverse=True
+        )
+        if states:
+            pulls = [pull for pull in pulls if pull['state'].upper() in states]
+        if updated_after:
+            pulls = [pull for pull in pulls if pull['updated_at'] >= updated_after]
+        return pulls
+
+def normalize_rest_pull(pull):
+    """
+    Convert a REST pull request (optionally with a recorded 'reviews' list)
+    into the record the GraphQL collector stores
+    """
+    review_times = sorted(
+        review['submitted_at'] for review in pull.get('reviews') or [] if review.get('submitted_at')
+    )
+    return {
+        'number': pull['number'],
+        'title': pull.get('title'),
+        'url': pull.get('html_url'),
+        'state': 'merged' if pull.get('merged_at') else pull.get('state', 'open'),
+        'is_draft': bool(pull.get('draft')),
+        'author': (pull.get('user') or {}).get('login'),
+        'created_at': pull['created_at'],
+        'updated_at': pull.get('updated_at') or pull.get('closed_at') or pull['created_at'],
+        'merged_at': pull.get('merged_at'),
+        'closed_at': pull.get('closed_at'),
+        'first_review_at': review_times[0] if review_times else None,
+        'review_count': len(review_times)
+    }
+
+def graphql_pull_node(pull):
+    """Render a normalized pull request as a GraphQL pullRequest node"""
+    return {
+        'number': pull['number'],
+        'title': pull['title'],
+        'url': pull['url'],
+        'state': pull['state'].upper(),
+        'isDraft': pull['is_draft'],
+        'createdAt': pull['created_at'],
+        'updatedAt': pull['updated_at'],
+        'mergedAt': pull['merged_at'],
+        'closedAt': pull['closed_at'],
+        'author': {'login': pull['author']} if pull['author'] else None,
+        'reviews': {
+            'totalCount': pull['review_count'],
+            'nodes': [{'submittedAt': pull['first_review_at']}] if pull['first_review_at'] else []
+        }
+    }
+
+def parse_created_filter(value):
+    """
+    Split a runs API created filter ('>=start', '<end' or 'start..end')
+    into (start, end); the end bound is treated as exclusive
+    """
+    if '..' in value:
+        start, end = value.split('..', 1)
+        return start or None, end or None
+    if value.startswith('<'):
+        return None, value.lstrip('<=') or None
+    return value.lstrip('>=') or None, None
+
+def make_handler(source, page_size=100):
+    """Build a request handler serving fixture data in GitHub REST API shapes"""
+    import hashlib
+    import urllib.parse
+    from http.server import BaseHTTPRequestHandler
+
+    class FixtureAPIHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            parts = url.path.strip('/').split('/')
+
+            try:
+                # /repos/{owner}/{repo}/...
+                route = parts[3:] if parts[:1] == ['repos'] and len(parts) > 3 else None
+                if route == ['actions', 'workflows']:
+                    items = source.list_workflows()
+                    self.send_page(url.path, query, items, 'workflows')
+                elif route and route[:2] == ['actions', 'workflows'] and route[3:] == ['runs']:
+                    start, end = parse_created_filter(query.get('created', ''))
+                    items = source.list_runs(source.find_workflow(route[2]), start, end=end)
+                    if query.get('branch'):
+                        items = [run for run in items if run.get('head_branch') == query['branch']]
+                    self.send_page(url.path, query, items, 'workflow_runs')
+                elif route == ['actions', 'runs']:
+                    items = source.list_recent_runs(query.get('branch'))
+                    self.send_page(url.path, query, items, 'workflow_runs')
+                elif route and route[:2] == ['actions', 'runs'] and len(route) == 3:
+                    self.send_json(source.get_run(int(route[2])))
+                elif route and route[:2] == ['actions', 'runs'] and route[3:] == ['jobs']:
+                    items = source.list_jobs(int(route[2]))
+                    self.send_page(url.path, query, items, 'jobs')
+                else:
+                    self.send_error(404)
+            except (KeyError, ValueError):
+                self.send_error(404)
+
+        def do_POST(self):
+            # Only the pull request query of the dashboard's collector is served
+            if urllib.parse.urlsplit(self.path).path.rstrip('/') != '/graphql':
+                self.send_error(404)
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                variables = json.loads(self.rfile.read(length)).get('variables') or {}
+                first = min(int(variables.get('first') or page_size), page_size)
+                offset = int(variables.get('after') or 0)
+            except ValueError:
+                self.send_error(400)
+                return
+
+            pulls = source.list_pull_requests(states=variables.get('states'))
+            chunk = pulls[offset:offset + first]
+            end = offset + len(chunk)
+            self.send_json({'data': {'repository': {'pullRequests': {
+                'pageInfo': {'hasNextPage': end < len(pulls), 'endCursor': str(end)},
+                'nodes': [graphql_pull_node(pull) for pull in chunk]
+            }}}})
+
+        def send_page(self, path, query, items, key):
+            per_page = min(int(query.get('per_page', page_size)), page_size)
+            page = int(query.get('page', 1))
+            chunk = items[(page - 1) * per_page:page * per_page]
+
+            headers = {}
+            if page * per_page < len(items):
+                next_query = dict(query, page=page + 1)
+                next_url = f'http://{self.headers["Host"]}{path}?{urllib.parse.urlencode(next_query)}'
+                headers['Link'] = f'<{next_url}>; rel="next"'
+
+            body = chunk if key is None else {'total_count': len(items), key: chunk}
+            self.send_json(body, headers)
+
+        def send_json(self, body, headers=None):
+            data = json.dumps(body).encode('utf-8')
+            etag = '"%s"' % hashlib.sha1(data).hexdigest()
+
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('ETag', etag)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return FixtureAPIHandler
+
+def start_fixture_server(source, host='127.0.0.1', port=0):
+    """Serve a fixture source on a background thread; returns (server, base URL)"""
+    import threading
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_handler(source))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+def generate_synthetic_fixtures(fixture_dir, run_count, workflow_count=10, pull_count=500, days=365, seed=0,
+                                job_runs=1000):
+    """
+    Write a synthetic history of workflow runs and pull requests, with jobs
+    and steps for the job_runs most recent runs
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+    def timestamp(value):
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    workflows = [
+        {'id': 1000 + index, 'name': f'Workflow {index + 1}', 'state': 'active',
+         'path': f'.github/workflows/workflow_{index + 1}.yml'}
+        for index in range(workflow_count)
+    ]
+    write_fixture(fixture_dir, 'workflows', workflows)
+
+    run_numbers = {workflow['id']: 0 for workflow in workflows}
+
+    def runs():
+        for run_id in range(1, run_count + 1):
+            workflow = workflows[rng.randrange(workflow_count)]
+            run_numbers[workflow['id']] += 1
+            created = now - datetime.timedelta(seconds=rng.randrange(days * 86400))
+            started = created + datetime.timedelta(seconds=rng.randrange(5, 300))
+            updated = started + datetime.timedelta(seconds=rng.randrange(60, 1800))
+            conclusion = rng.choices(['success', 'failure', 'cancelled', 'skipped'], [80, 12, 5, 3])[0]
+            yield {
+                'id': run_id,
+                'workflow_id': workflow['id'],
+                'name': workflow['name'],
+                'status': 'completed',
+                'conclusion': conclusion,
+                'path': workflow['path'],
+                'head_branch': rng.choice(['main', 'main', 'develop']),
+                'event': rng.choice(['push', 'pull_request', 'schedule']),
+                'run_number': run_numbers[workflow['id']],
+                'html_url': f'https://github.com/fixtures/replay/actions/runs/{run_id}',
+                'created_at': timestamp(created),
+                'run_started_at': timestamp(started),
+                'updated_at': timestamp(updated)
+            }
+
+    generated_runs = list(runs())
+    write_fixture(fixture_dir, 'runs', generated_runs)
+
+    # Odd-numbered workflows pretend to install the Flutter SDK without the cache
+    def jobs():
+        recent = sorted(generated_runs, key=lambda run: run['created_at'], reverse=True)[:job_runs]
+        for job_id, run in enumerate(recent, start=1):
+            uncached = int(run['path'].rsplit('_', 1)[-1].split('.')[0]) % 2 == 1
+            clock = datetime.datetime.strptime(run['run_started_at'], '%Y-%m-%dT%H:%M:%SZ').replace(
+                tzinfo=datetime.timezone.utc
+            )
+            created = clock
+            clock += datetime.timedelta(seconds=rng.randrange(2, 120))
+            started = clock
+
+            steps = []
+            for number, (name, low, high) in enumerate([
+                ('Set up job', 1, 5),
+                ('Run actions/checkout@v3', 2, 8),
+                ('Setup Flutter', 60, 180) if uncached else ('Setup Flutter', 8, 30),
+                ('Install dependencies', 15, 90),
+                ('Run tests', 60, 600),
+                ('Build APK', 120, 900) if rng.random() < 0.3 else ('Analyze code', 10, 60),
+                ('Upload artifacts', 3, 30),
+                ('Post Setup Flutter', 1, 10),
+                ('Complete job', 0, 2)
+            ], start=1):
+                step_start = clock
+                clock += datetime.timedelta(seconds=rng.randrange(low, high + 1))
+                steps.append({
+                    'name': name, 'number': number, 'status': 'completed', 'conclusion': 'success',
+                    'started_at': timestamp(step_start), 'completed_at': timestamp(clock)
+                })
+
+            yield {
+                'id': job_id,
+                'run_id': run['id'],
+                'name': 'build',
+                'status': 'completed',
+                'conclusion': run['conclusion'],
+                'created_at': timestamp(created),
+                'started_at': timestamp(started),
+                'completed_at': timestamp(clock),
+                'labels': [rng.choice(['ubuntu-latest', 'ubuntu-latest', 'macos-latest'])],
+                'runner_name': 'GitHub Actions',
+                'steps': steps
+            }
+
+    write_fixture(fixture_dir, 'jobs', jobs())
+
+    def pulls():
+        for number in range(1, pull_count + 1):
+            created = now - datetime.timedelta(seconds=rng.randrange(days * 86400))
+            merged = rng.random() < 0.8
+            closed = created + datetime.timedelta(seconds=rng.randrange(600, 7 * 86400))
+            is_open = not merged and rng.random() < 0.5
+            reviews = [
+                {'submitted_at': timestamp(created + datetime.timedelta(seconds=rng.randrange(300, 3 * 86400)))}
+                for _ in range(rng.choice([0, 1, 1, 2, 3]))
+            ]
+            yield {
+                'number': number,
+                'title': f'Synthetic change #{number}',
+                'state': 'open' if is_open else 'closed',
+                'html_url': f'https://github.com/fixtures/replay/pull/{number}',
+                'user': {'login': rng.choice(['alice', 'bob', 'carol'])},
+                'created_at': timestamp(created),
+                'updated_at': timestamp(closed if not is_open else created),
+                'closed_at': None if is_open else timestamp(closed),
+                'merged_at': timestamp(closed) if merged else None,
+                'reviews': reviews
+            }
+
+    write_fixture(fixture_dir, 'pulls', pulls())
+    print(f"Wrote {run_count} runs and {pull_count} pull requests to {fixture_dir}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline GitHub data for the CI/CD dashboard')
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve = subparsers.add_parser('serve', help='Serve fixtures through a local GitHub REST API stand-in')
+    serve.add_argument('fixtures', help='Fixture directory')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+
+    generate = subparsers.add_parser('generate', help='Write a synthetic run history')
+    generate.add_argument('fixtures', help='Fixture directory')
+    generate.add_argument('--runs', type=int, default=100000)
+    generate.add_argument('--workflows', type=int, default=10)
+    generate.add_argument('--pulls', type=int, default=500)
+    generate.add_argument('--days', type=int, default=365)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--job-runs', type=int, default=1000,
+                          help='Most recent runs that get synthetic jobs and steps (default: 1000)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        from http.server import ThreadingHTTPServer
+
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(FixtureSource(args.fixtures)))
+        print(f"Serving {args.fixtures} at http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == 'generate':
+        generate_synthetic_fixtures(
+            args.fixtures, args.runs, args.workflows, args.pulls, args.days, args.seed, args.job_runs
+        )
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# flaky_tests.py - Per-test outcome history and flakiness scores
+#
+# Results are read from `flutter test --machine` event streams while the
+# tests run and stored in SQLite keyed by the tree of the code under test,
+# with test names and trees interned so each result is a row of small
+# integers. A test is flaky when its outcome flips between passing and
+# failing on identical code.
+
+import os
+import sys
+import json
+import datetime
+import argparse
+import subprocess
+
+TEST_RESULTS_FILE = os.path.join('.github', 'cache', 'test_results.sqlite')
+# Outcomes as stored; 'error' results count as failures
+PASSED, FAILED, SKIPPED = 0, 1, 2
+OUTCOMES = {'success': PASSED, 'failure': FAILED, 'error': FAILED}
+DEFAULT_FLAKY_THRESHOLD = 0.1
+# Most recent code trees considered when scoring
+DEFAULT_FLAKY_WINDOW = 200
+
+def iter_machine_events(lines, on_text=None):
+    """
+    Decode `flutter test --machine` output line by line.
+
+    The stream mixes JSON events with plain build and log lines; anything
+    that is not a JSON object is passed to on_text, if given, and skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        event = None
+        if line.startswith('{'):
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                pass
+        if isinstance(event, dict):
+            yield event
+        elif line and on_text:
+            on_text(line)
+
+def iter_test_results(events, suite_times=None):
+    """
+    Turn machine events into one result per finished test:
+    {name, suite, test, outcome, duration_ms, error}.
+
+    Hidden tests (the runner's per-file "loading" test) are only reported
+    when they fail, which is how compile and load errors show up. When
+    suite_times is a dict, it receives the (first, last) event time in ms
+    of every test file, loading included.
+    """
+    suites = {}
+    running = {}
+    errors = {}
+
+    def track(suite_id, when):
+        path = suites.get(suite_id)
+        if suite_times is None or path is None or when is None:
+            return
+        first, last = suite_times.get(path, (when, when))
+        suite_times[path] = (min(first, when), max(last, when))
+
+    for event in events:
+        kind = event.get('type')
+        if kind == 'suite':
+            suite = event.get('suite', {})
+            path = suite.get('path') or ''
+            suites[suite.get('id')] = os.path.relpath(path) if os.path.isabs(path) else path
+        elif kind == 'testStart':
+            test = event.get('test', {})
+            running[test.get('id')] = (test.get('name') or '', test.get('suiteID'), event.get('time', 0))
+            track(test.get('suiteID'), event.get('time'))
+        elif kind == 'error':
+            errors.setdefault(event.get('testID'), event.get('error'))
+        elif kind == 'testDone':
+            test_id = event.get('testID')
+            name, suite_id, start = running.pop(test_id, ('', None, event.get('time', 0)))
+            track(suite_id, event.get('time'))
+            error = errors.pop(test_id, None)
+            result = event.get('result')
+            if event.get('hidden') and result == 'success':
+                continue
+
+            suite = suites.get(suite_id, '')
+            yield {
+                'name': f"{suite}::{name}",
+                'suite': suite,
+                'test': name,
+                'outcome': 'skipped' if event.get('skipped') else result,
+                'duration_ms': max(0, (event.get('time') or 0) - (start or 0)),
+                'error': error
+            }
+
+def code_revision():
+    """
+    Identify the code under test by its git tree, so rebuilds and re-runs of
+    identical code share results; falls back to GITHUB_SHA
+    """
+    result = subprocess.run(['git', 'rev-parse', 'HEAD^{tree}'], capture_output=True, text=True)
+    if result.returncode == 0:
+        return result.stdout.strip()
+    return os.environ.get('GITHUB_SHA', 'unknown')
+
+class TestResultStore:
+    """
+    SQLite store of per-test outcomes: one row per test attempt, grouped
+    into runs, each run tied to the code revision it tested
+    """
+
+    def __init__(self, path=TEST_RESULTS_FILE):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS revisions (id INTEGER PRIMARY KEY, revision TEXT UNIQUE);
+            CREATE TABLE IF NOT EXISTS tests (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                revision_id INTEGER,
+                label TEXT,
+                started_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                run_id INTEGER,
+                test_id INTEGER,
+                attempt INTEGER,
+                outcome INTEGER,
+                duration_ms INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS results_test ON results (test_id, run_id);
+        """)
+        self.test_ids = {name: test_id for test_id, name in self.db.execute("SELECT id, name FROM tests")}
+
+    def close(self):
+        self.db.close()
+
+    def start_run(self, revision, label=None):
+        """Register a test run of a code revision and return its id"""
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO revisions (revision) VALUES (?)", (revision,))
+            revision_id = self.db.execute(
+                "SELECT id FROM revisions WHERE revision = ?", (revision,)
+            ).fetchone()[0]
+            cursor = self.db.execute(
+                "INSERT INTO runs (revision_id, label, started_at) VALUES (?, ?, ?)",
+                (revision_id, label, datetime.datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+
+    def test_id(self, name):
+        test_id = self.test_ids.get(name)
+        if test_id is None:
+            test_id = self.db.execute("INSERT INTO tests (name) VALUES (?)", (name,)).lastrowid
+            self.test_ids[name] = test_id
+        return test_id
+
+    def add_results(self, run_id, results, attempt=1):
+        """Store test results of one attempt; skipped tests are kept as SKIPPED"""
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+                [(
+                    run_id, self.test_id(result['name']), attempt,
+                    OUTCOMES.get(result['outcome'], SKIPPED), int(result['duration_ms'])
+                ) for result in results]
+            )
+
+    def outcome_history(self, window=DEFAULT_FLAKY_WINDOW):
+        """(test name, revision id, outcome) rows of the latest revisions, in run order"""
+        return self.db.execute("""
+            SELECT tests.name, runs.revision_id, results.outcome
+            FROM results
+            JOIN runs ON runs.id = results.run_id
+            JOIN tests ON tests.id = results.test_id
+            WHERE results.outcome != ? AND runs.revision_id IN (
+                SELECT id FROM revisions ORDER BY id DESC LIMIT ?
+            )
+            ORDER BY results.test_id, runs.revision_id, runs.id, results.attempt
+        """, (SKIPPED, window)).fetchall()
+
+def compute_flakiness(rows):
+    """
+    Score each test by how often consecutive outcomes on the same revision
+    disagree: flips / comparisons. A test that fails consistently on a
+    revision scores 0 there; that is a real failure, not a flake.
+    """
+    scores = {}
+    previous_key = None
+    previous_outcome = None
+
+    for name, revision_id, outcome in rows:
+        entry = scores.setdefault(name, {'flips': 0, 'comparisons': 0, 'revisions': set(), 'flaky_revisions': set()})
+        entry['revisions'].add(revision_id)
+        if previous_key == (name, revision_id):
+            entry['comparisons'] += 1
+            if outcome != previous_outcome:
+                entry['flips'] += 1
+                entry['flaky_revisions'].add(revision_id)
+        previous_key = (name, revision_id)
+        previous_outcome = outcome
+
+    return {
+        name: {
+            'score': round(entry['flips'] / entry['comparisons'], 3) if entry['comparisons'] else 0.0,
+            'flips': entry['flips'],
+            'revisions': len(entry['revisions']),
+            'flaky_revisions': len(entry['flaky_revisions'])
+        }
+        for name, entry in scores.items()
+    }
+
+def load_flaky_tests(results_file=TEST_RESULTS_FILE, threshold=DEFAULT_FLAKY_THRESHOLD, window=DEFAULT_FLAKY_WINDOW):
+    """Tests whose flakiness score reaches the threshold, with their scores"""
+    if not os.path.exists(results_file):
+        return {}
+
+    store = TestResultStore(results_file)
+    try:
+        scores = compute_flakiness(store.outcome_history(window))
+    finally:
+        store.close()
+    return {
+        name: entry for name, entry in scores.items()
+        if entry['flips'] and entry['score'] >= threshold
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Track per-test outcomes and report flaky tests')
+    parser.add_argument('--results-file', default=TEST_RESULTS_FILE,
+                        help=f'Test result history (default: {TEST_RESULTS_FILE})')
+    subparsers = parser.add_subparsers(dest='command')
+
+    ingest = subparsers.add_parser('ingest', help="Record results from 'flutter test --machine' output")
+    ingest.add_argument('input', help="Machine output file, or '-' to read it from stdin as it is produced")
+    ingest.add_argument('--revision', help='Code revision tested (default: the git tree of HEAD)')
+    ingest.add_argument('--label', help='Free-form run label, e.g. the CI job name')
+
+    report = subparsers.add_parser('report', help='List flaky tests')
+    report.add_argument('--threshold', type=float, default=DEFAULT_FLAKY_THRESHOLD,
+                        help=f'Minimum flakiness score (default: {DEFAULT_FLAKY_THRESHOLD})')
+    report.add_argument('--window', type=int, default=DEFAULT_FLAKY_WINDOW,
+                        help=f'Number of recent code revisions considered (default: {DEFAULT_FLAKY_WINDOW})')
+    report.add_argument('--json', action='store_true', help='Print the flaky tests as JSON')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        store = TestResultStore(args.results_file)
+        run_id = store.start_run(args.revision or code_revision(), args.label)
+        stream = sys.stdin if args.input == '-' else open(args.input, 'r')
+        count = 0
+        try:
+            batch = []
+            for result in iter_test_results(iter_machine_events(stream)):
+                batch.append(result)
+                if len(batch) >= 500:
+                    store.add_results(run_id, batch)
+                    count += len(batch)
+                    batch = []
+            store.add_results(run_id, batch)
+            count += len(batch)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            store.close()
+        print(f"Recorded {count} test results")
+    elif args.command == 'report':
+        flaky = load_flaky_tests(args.results_file, args.threshold, args.window)
+        ranked = sorted(flaky.items(), key=lambda item: (-item[1]['score'], item[0]))
+        if args.json:
+            print(json.dumps([dict(entry, name=name) for name, entry in ranked], indent=2))
+        elif not ranked:
+            print("No flaky tests found.")
+        else:
+            print(f"{'score':>6} {'flips':>6} {'revs':>5}  test")
+            for name, entry in ranked:
+                print(f"{entry['score']:>6.2f} {entry['flips']:>6} {entry['flaky_revisions']:>5}  {name}")
+    else:
+        parser.print_help()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
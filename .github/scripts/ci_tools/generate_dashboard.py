@@ -0,0 +1,1169 @@
+#!/usr/bin/env python3
+# generate_dashboard.py - Generate CI/CD dashboard for FootballHero
+
+import os
+import re
+import sys
+import json
+import datetime
+import argparse
+
+def setup_environment():
+    """Ensure dashboard output directory exists"""
+    os.makedirs('dashboard', exist_ok=True)
+    
+    # Copy static assets
+    import shutil
+    shutil.copy('.github/templates/dashboard_styles.css', 'dashboard/styles.css')
+
+DEFAULT_SINCE = '30d'
+DEFAULT_MAX_RUNS = 200
+DEFAULT_FETCH_WORKERS = 4
+
+def parse_since(value):
+    """Parse a window start given as '<days>d' or an ISO date into a UTC datetime"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if value.endswith('d') and value[:-1].isdigit():
+        return now - datetime.timedelta(days=int(value[:-1]))
+    
+    since = datetime.datetime.fromisoformat(value)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.timezone.utc)
+    return since
+
+REPO_NAME = 'asadlr/football_hero'
+GITHUB_API_URL = 'https://api.github.com'
+RUN_CACHE_FILE = os.path.join('.github', 'cache', 'dashboard.sqlite')
+# Conditional-request validators not used for this long are dropped, and
+# the table is capped, so the persisted store does not grow with every build
+HTTP_CACHE_MAX_AGE_DAYS = 7
+HTTP_CACHE_MAX_ROWS = 500
+# Completed runs whose jobs are fetched per build; older runs fill in over later builds
+DEFAULT_MAX_JOB_RUNS = 200
+# Pull requests per GraphQL page (the API maximum) and pages per sync
+PULL_PAGE_SIZE = 100
+
+PULL_REQUEST_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String, $states: [PullRequestState!]) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title url state isDraft createdAt updatedAt mergedAt closedAt
+        author { login }
+        reviews(first: 1) { totalCount nodes { submittedAt } }
+      }
+    }
+  }
+}
+"""
+
+class RunStore:
+    """
+    SQLite store of workflow runs keyed by run id, plus the ETag/Last-Modified
+    validators (and, where needed, bodies) of conditional API responses.
+
+    Runs are kept after GitHub's retention window expires, so trends can reach
+    back further than the API does.
+    """
+    
+    def __init__(self, path=RUN_CACHE_FILE):
+        import sqlite3
+        import threading
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                workflow_id INTEGER,
+                workflow_name TEXT,
+                status TEXT,
+                conclusion TEXT,
+                event TEXT,
+                run_number INTEGER,
+                run_url TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                payload TEXT
+            );
+            CREATE INDEX IF NOT EXISTS runs_workflow_created ON runs (workflow_id, created_at);
+            CREATE INDEX IF NOT EXISTS runs_status ON runs (status);
+            CREATE TABLE IF NOT EXISTS run_coverage (
+                workflow_id INTEGER PRIMARY KEY,
+                covered_from TEXT
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                run_id INTEGER,
+                name TEXT,
+                conclusion TEXT,
+                created_at TEXT,
+                started_at TEXT,
+                completed_at TEXT,
+                labels TEXT,
+                runner_name TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_run ON jobs (run_id);
+            CREATE TABLE IF NOT EXISTS steps (
+                job_id INTEGER,
+                number INTEGER,
+                name TEXT,
+                conclusion TEXT,
+                started_at TEXT,
+                completed_at TEXT,
+                PRIMARY KEY (job_id, number)
+            );
+            CREATE TABLE IF NOT EXISTS job_fetches (
+                run_id INTEGER PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS pulls (
+                number INTEGER PRIMARY KEY,
+                state TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                merged_at TEXT,
+                first_review_at TEXT,
+                payload TEXT
+            );
+            CREATE TABLE IF NOT EXISTS http_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT,
+                used_at TEXT
+            );
+        """)
+    
+    def close(self):
+        self.db.close()
+    
+    def upsert_runs(self, runs):
+        """Insert or refresh runs from workflow run API payloads"""
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    run['id'], run.get('workflow_id'), run.get('name'), run.get('status'),
+                    run.get('conclusion'), run.get('event'), run.get('run_number'),
+                    run.get('html_url'), run.get('created_at'), run.get('updated_at'),
+                    json.dumps(run)
+                ) for run in runs]
+            )
+    
+    def latest_created_at(self, workflow_id):
+        """Creation time of the newest stored run of a workflow"""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT MAX(created_at) FROM runs WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+        return row[0]
+    
+    def run_coverage(self, workflow_id):
+        """
+        Start of the span up to the newest stored run in which every run of
+        a workflow is stored, or None when unknown
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT covered_from FROM run_coverage WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_run_coverage(self, workflow_id, covered_from):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO run_coverage VALUES (?, ?)", (workflow_id, covered_from))
+    
+    def unfinished_run_ids(self):
+        """Ids of stored runs that were still queued or in progress"""
+        with self.lock:
+            rows = self.db.execute("SELECT id FROM runs WHERE status != 'completed'").fetchall()
+        return [row[0] for row in rows]
+    
+    def runs_missing_jobs(self, since=None, limit=None):
+        """Newest completed runs whose jobs have not been fetched yet"""
+        query = (
+            "SELECT id FROM runs WHERE status = 'completed' "
+            "AND id NOT IN (SELECT run_id FROM job_fetches)"
+        )
+        params = []
+        if since is not None:
+            query += " AND created_at >= ?"
+            params.append(since.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        query += " ORDER BY created_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            return [row[0] for row in self.db.execute(query, params).fetchall()]
+    
+    def upsert_jobs(self, run_id, jobs):
+        """
+        Store the jobs and steps of a completed run; the run is marked as
+        fetched even when it had no jobs, so it is not requested again
+        """
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    job['id'], run_id, job.get('name'), job.get('conclusion'), job.get('created_at'),
+                    job.get('started_at'), job.get('completed_at'), json.dumps(job.get('labels') or []),
+                    job.get('runner_name')
+                ) for job in jobs]
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?)",
+                [(
+                    job['id'], step.get('number'), step.get('name'), step.get('conclusion'),
+                    step.get('started_at'), step.get('completed_at')
+                ) for job in jobs for step in job.get('steps') or []]
+            )
+            self.db.execute("INSERT OR REPLACE INTO job_fetches VALUES (?)", (run_id,))
+    
+    def upsert_pulls(self, pulls):
+        """Insert or refresh pull requests given as normalized PR records"""
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO pulls VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    pull['number'], pull['state'], pull['created_at'], pull['updated_at'],
+                    pull['merged_at'], pull['first_review_at'], json.dumps(pull)
+                ) for pull in pulls]
+            )
+    
+    def latest_pull_updated_at(self):
+        """Update time of the most recently updated stored pull request"""
+        with self.lock:
+            return self.db.execute("SELECT MAX(updated_at) FROM pulls").fetchone()[0]
+    
+    def get_cached_response(self, url):
+        with self.lock:
+            return self.db.execute(
+                "SELECT etag, last_modified, body FROM http_validators WHERE url = ?", (url,)
+            ).fetchone()
+    
+    def put_cached_response(self, url, etag, last_modified, body=None):
+        """Store a response's validators; body is kept only when given"""
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO http_validators VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, datetime.datetime.now(datetime.timezone.utc).isoformat())
+            )
+    
+    def touch_cached_response(self, url):
+        """Mark cached validators as used, so pruning keeps them"""
+        with self.lock, self.db:
+            self.db.execute(
+                "UPDATE http_validators SET used_at = ? WHERE url = ?",
+                (datetime.datetime.now(datetime.timezone.utc).isoformat(), url)
+            )
+    
+    def prune_http_cache(self, max_age_days=HTTP_CACHE_MAX_AGE_DAYS, max_rows=HTTP_CACHE_MAX_ROWS):
+        """
+        Drop validators unused for max_age_days, then all but the max_rows
+        most recently used; returns the number of rows removed
+        """
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=max_age_days)
+        with self.lock, self.db:
+            removed = self.db.execute(
+                "DELETE FROM http_validators WHERE used_at < ?", (cutoff.isoformat(),)
+            ).rowcount
+            removed += self.db.execute(
+                "DELETE FROM http_validators WHERE url NOT IN "
+                "(SELECT url FROM http_validators ORDER BY used_at DESC LIMIT ?)", (max_rows,)
+            ).rowcount
+        return removed
+    
+    def load_dataframe(self, since=None):
+        """Load stored runs as a DataFrame, one row per run"""
+        query = (
+            "SELECT workflow_name, status, conclusion, created_at, updated_at, "
+            "json_extract(payload, '$.run_started_at') AS run_started_at, "
+            "run_number, run_url, event FROM runs"
+        )
+        params = ()
+        if since is not None:
+            query += " WHERE created_at >= ?"
+            params = (since.strftime('%Y-%m-%dT%H:%M:%SZ'),)
+        
+        import pandas as pd
+        
+        with self.lock:
+            df = pd.read_sql_query(query, self.db, params=params)
+        
+        for column in ('created_at', 'updated_at', 'run_started_at'):
+            df[column] = pd.to_datetime(df[column], utc=True)
+        return df
+    
+    def load_job_dataframes(self, since=None):
+        """
+        Load stored jobs (with their run's workflow and timestamps) and
+        steps of runs in the window, as two DataFrames
+        """
+        where = ""
+        params = ()
+        if since is not None:
+            where = " WHERE runs.created_at >= ?"
+            params = (since.strftime('%Y-%m-%dT%H:%M:%SZ'),)
+        
+        jobs_query = (
+            "SELECT jobs.id AS job_id, jobs.run_id, runs.workflow_name, "
+            "json_extract(runs.payload, '$.path') AS workflow_path, jobs.name AS job_name, "
+            "jobs.conclusion, jobs.created_at, jobs.started_at, jobs.completed_at, jobs.labels "
+            "FROM jobs JOIN runs ON runs.id = jobs.run_id" + where
+        )
+        steps_query = (
+            "SELECT steps.job_id, runs.workflow_name, steps.name AS step_name, "
+            "steps.started_at, steps.completed_at FROM steps "
+            "JOIN jobs ON jobs.id = steps.job_id JOIN runs ON runs.id = jobs.run_id" + where
+        )
+        
+        import pandas as pd
+        
+        with self.lock:
+            jobs_df = pd.read_sql_query(jobs_query, self.db, params=params)
+            steps_df = pd.read_sql_query(steps_query, self.db, params=params)
+        
+        for df, columns in ((jobs_df, ('created_at', 'started_at', 'completed_at')),
+                            (steps_df, ('started_at', 'completed_at'))):
+            for column in columns:
+                df[column] = pd.to_datetime(df[column], utc=True)
+        return jobs_df, steps_df
+    
+    def load_pull_dataframe(self, since=None):
+        """Load open pull requests and those updated since the window start"""
+        query = (
+            "SELECT number, json_extract(payload, '$.title') AS title, "
+            "json_extract(payload, '$.author') AS author, json_extract(payload, '$.url') AS url, "
+            "state, created_at, merged_at, first_review_at, "
+            "json_extract(payload, '$.review_count') AS review_count FROM pulls"
+        )
+        params = ()
+        if since is not None:
+            query += " WHERE state = 'open' OR updated_at >= ?"
+            params = (since.strftime('%Y-%m-%dT%H:%M:%SZ'),)
+        
+        import pandas as pd
+        
+        with self.lock:
+            df = pd.read_sql_query(query, self.db, params=params)
+        
+        for column in ('created_at', 'merged_at', 'first_review_at'):
+            df[column] = pd.to_datetime(df[column], utc=True)
+        return df
+
+class GitHubClient:
+    """
+    Minimal GitHub REST client with conditional requests.
+
+    Requests made with conditional=True (URLs that are requested again
+    unchanged, such as the workflow list or an in-progress run) store their
+    ETag and Last-Modified validators in the RunStore, if one is given; a
+    304 reply does not count against the rate limit. With keep_parsed,
+    decoded responses are kept as well, so polling the same URLs never
+    decodes a body twice.
+    """
+    
+    def __init__(self, token, repo_name=REPO_NAME, base_url=GITHUB_API_URL, store=None, keep_parsed=False):
+        self.token = token
+        self.repo_name = repo_name
+        self.base_url = base_url.rstrip('/')
+        self.store = store
+        self.request_count = 0
+        self.parsed = {} if keep_parsed else None
+    
+    def headers(self):
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28'
+        }
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        return headers
+    
+    def request(self, path, params=None, conditional=False, keep_body=True):
+        """
+        GET a path or absolute URL and return (data, next page URL).
+
+        With conditional, the request carries the validators of the previous
+        response to the same URL. A 304 reply is answered from the stored
+        body, or with None as data when keep_body is off and only the
+        validators were stored (the caller already has the data).
+        """
+        import urllib.error
+        import urllib.parse
+        import urllib.request
+        
+        url = path if path.startswith('http') else f'{self.base_url}{path}'
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        
+        headers = self.headers()
+        store = self.store if conditional else None
+        cached = store.get_cached_response(url) if store else None
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        self.request_count += 1
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+                body = response.read().decode('utf-8')
+                response_headers = response.headers
+                etag, last_modified = response_headers.get('ETag'), response_headers.get('Last-Modified')
+                if store and (etag or last_modified):
+                    store.put_cached_response(url, etag, last_modified, body if keep_body else None)
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not cached:
+                raise
+            store.touch_cached_response(url)
+            body = cached[2]
+            response_headers = e.headers
+            if self.parsed is not None and url in self.parsed:
+                return self.parsed[url], self._next_link(response_headers.get('Link'))
+            if body is None:
+                return None, self._next_link(response_headers.get('Link'))
+        
+        data = json.loads(body)
+        if self.parsed is not None:
+            self.parsed[url] = data
+        return data, self._next_link(response_headers.get('Link'))
+    
+    @staticmethod
+    def _next_link(link_header):
+        for part in (link_header or '').split(','):
+            if 'rel="next"' in part:
+                return part[part.index('<') + 1:part.index('>')]
+        return None
+    
+    def paginate(self, path, key=None, params=None, conditional=False):
+        """Yield the items under key (or of a bare list) from every page of a list endpoint"""
+        data, next_url = self.request(path, params, conditional)
+        yield from data if key is None else data.get(key, [])
+        while next_url:
+            data, next_url = self.request(next_url, conditional=conditional)
+            yield from data if key is None else data.get(key, [])
+    
+    def list_workflows(self):
+        return list(self.paginate(f'/repos/{self.repo_name}/actions/workflows', 'workflows', conditional=True))
+    
+    def list_runs(self, workflow, start=None, max_runs=None, end=None):
+        """Runs of a workflow created at or after start and before end, newest first"""
+        params = {'per_page': 100}
+        if start and end:
+            params['created'] = f'{start}..{end}'
+        elif start:
+            params['created'] = f'>={start}'
+        elif end:
+            params['created'] = f'<{end}'
+        
+        runs = []
+        path = f"/repos/{self.repo_name}/actions/workflows/{workflow['id']}/runs"
+        for run in self.paginate(path, 'workflow_runs', params):
+            # The API range is inclusive; runs at end are already stored
+            if end and run['created_at'] >= end:
+                continue
+            # Stop paging as soon as runs fall outside the window
+            if start and run['created_at'] < start:
+                break
+            runs.append(run)
+            if max_runs and len(runs) >= max_runs:
+                break
+        return runs
+    
+    def get_run(self, run_id):
+        """A run's current payload, or None when it has not changed since the last request"""
+        return self.request(f'/repos/{self.repo_name}/actions/runs/{run_id}', conditional=True, keep_body=False)[0]
+    
+    def list_jobs(self, run_id):
+        """Jobs of a run, with their steps and runner labels"""
+        return list(self.paginate(
+            f'/repos/{self.repo_name}/actions/runs/{run_id}/jobs', 'jobs', {'per_page': 100}
+        ))
+    
+    def graphql(self, query, variables=None):
+        """POST a GraphQL query and return its data, raising on GraphQL errors"""
+        import urllib.request
+        
+        # GitHub Enterprise serves REST under /api/v3 and GraphQL under /api/graphql
+        if self.base_url.endswith('/api/v3'):
+            url = self.base_url[:-len('/v3')] + '/graphql'
+        else:
+            url = f'{self.base_url}/graphql'
+        
+        body = json.dumps({'query': query, 'variables': variables or {}}).encode('utf-8')
+        headers = dict(self.headers(), **{'Content-Type': 'application/json'})
+        self.request_count += 1
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers)) as response:
+            result = json.loads(response.read().decode('utf-8'))
+        
+        if result.get('errors'):
+            raise RuntimeError('; '.join(error.get('message', str(error)) for error in result['errors']))
+        return result['data']
+    
+    def list_pull_requests(self, updated_after=None, states=None):
+        """
+        Pull requests with their first review, most recently updated first,
+        back to updated_after and optionally limited to GraphQL states such
+        as ['OPEN']. Each GraphQL page carries 100 PRs with their reviews,
+        instead of one REST call per PR.
+        """
+        owner, name = self.repo_name.split('/', 1)
+        pulls = []
+        cursor = None
+        while True:
+            data = self.graphql(PULL_REQUEST_QUERY, {
+                'owner': owner, 'name': name, 'first': PULL_PAGE_SIZE, 'after': cursor, 'states': states
+            })
+            connection = data['repository']['pullRequests']
+            for node in connection['nodes']:
+                if updated_after and node['updatedAt'] < updated_after:
+                    return pulls
+                pulls.append(normalize_graphql_pull(node))
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            cursor = connection['pageInfo']['endCursor']
+        return pulls
+
+def normalize_graphql_pull(node):
+    """Flatten a GraphQL pullRequest node into the stored PR record"""
+    reviews = node.get('reviews') or {}
+    first_review = (reviews.get('nodes') or [{}])[0]
+    return {
+        'number': node['number'],
+        'title': node.get('title'),
+        'url': node.get('url'),
+        'state': node['state'].lower(),
+        'is_draft': bool(node.get('isDraft')),
+        'author': (node.get('author') or {}).get('login'),
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'merged_at': node.get('mergedAt'),
+        'closed_at': node.get('closedAt'),
+        'first_review_at': first_review.get('submittedAt'),
+        'review_count': reviews.get('totalCount', 0)
+    }
+
+def fetch_new_runs(source, workflow, since=None, max_runs=None, watermark=None, covered_from=None):
+    """
+    Fetch a workflow's runs within a budget of max_runs: first the runs
+    created since the newest stored run (watermark) or the window start,
+    then older runs back from covered_from towards the window start.
+
+    covered_from is where the span of completely stored runs begins; runs
+    cut off by the budget are fetched by later syncs. Returns the runs and
+    the new covered_from.
+    """
+    window = since.strftime('%Y-%m-%dT%H:%M:%SZ') if since is not None else ''
+    start = watermark if watermark and watermark > window else window
+    
+    runs = source.list_runs(workflow, start or None, max_runs)
+    if max_runs and len(runs) >= max_runs:
+        # Runs between the stored ones and the oldest fetched are missing
+        covered_from = runs[-1]['created_at']
+    elif watermark is None:
+        covered_from = window
+    else:
+        covered_from = covered_from if covered_from is not None else watermark
+    
+    budget = max_runs - len(runs) if max_runs else None
+    if covered_from > window and budget != 0:
+        older = source.list_runs(workflow, window or None, budget, end=covered_from)
+        runs.extend(older)
+        covered_from = older[-1]['created_at'] if budget and len(older) >= budget else window
+    
+    return runs, covered_from
+
+def sync_workflow_runs(source, store, since=None, max_runs=None, max_workers=DEFAULT_FETCH_WORKERS):
+    """
+    Bring the run store up to date: fetch runs created since the newest stored
+    run of each workflow and fill in older runs of the window that earlier,
+    capped syncs did not reach, then refresh runs that were still in progress.
+
+    source is any data source with list_workflows/list_runs/get_run: the live
+    GitHubClient or a dashboard_fixtures.FixtureSource.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    workflows = source.list_workflows()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                fetch_new_runs, source, workflow, since, max_runs,
+                store.latest_created_at(workflow['id']), store.run_coverage(workflow['id'])
+            )
+            for workflow in workflows
+        ]
+        for workflow, future in zip(workflows, futures):
+            try:
+                runs, covered_from = future.result()
+                store.upsert_runs(runs)
+                store.set_run_coverage(workflow['id'], covered_from)
+            except Exception as e:
+                print(f"Error retrieving runs for workflow {workflow['name']}: {e}")
+        
+        unfinished = store.unfinished_run_ids()
+        futures = [executor.submit(source.get_run, run_id) for run_id in unfinished]
+        for run_id, future in zip(unfinished, futures):
+            try:
+                run = future.result()
+                if run is not None:
+                    store.upsert_runs([run])
+            except Exception as e:
+                print(f"Error refreshing run {run_id}: {e}")
+
+def sync_run_jobs(source, store, since=None, max_runs=DEFAULT_MAX_JOB_RUNS, max_workers=DEFAULT_FETCH_WORKERS):
+    """
+    Fetch jobs and steps of completed runs that have none stored yet,
+    newest first and concurrently. Finished runs never change, so each
+    run's jobs are requested once.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    run_ids = store.runs_missing_jobs(since, max_runs)
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(source.list_jobs, run_id) for run_id in run_ids]
+        for run_id, future in zip(run_ids, futures):
+            try:
+                store.upsert_jobs(run_id, future.result())
+                fetched += 1
+            except Exception as e:
+                print(f"Error retrieving jobs for run {run_id}: {e}")
+    return fetched
+
+def sync_pull_requests(source, store, since=None):
+    """
+    Bring the stored pull requests up to date: fetch PRs updated since the
+    most recently updated stored PR or the window start, whichever is later,
+    and all open PRs, which count towards the open PR stats however long
+    ago they were last updated.
+
+    Both queries page until they are exhausted: the newest stored update
+    time is the watermark for the next sync, so stopping early would skip
+    the PRs between the last page and the watermark for good.
+    """
+    start = since.strftime('%Y-%m-%dT%H:%M:%SZ') if since is not None else None
+    watermark = store.latest_pull_updated_at()
+    if watermark and (start is None or watermark > start):
+        start = watermark
+    
+    pulls = source.list_pull_requests(start)
+    fetched = {pull['number'] for pull in pulls}
+    pulls.extend(
+        pull for pull in source.list_pull_requests(None, states=['OPEN'])
+        if pull['number'] not in fetched
+    )
+    store.upsert_pulls(pulls)
+    return len(pulls)
+
+def create_data_source(kind, token=None, fixtures=None, api_url=GITHUB_API_URL, repo_name=REPO_NAME, store=None):
+    """
+    Build the dashboard's data source.
+
+    'live' talks to the GitHub REST API at api_url, 'replay' reads recorded
+    fixtures directly, and 'server' serves the fixtures through a local REST
+    stand-in and talks to it over HTTP like the live backend does.
+    """
+    if kind == 'live':
+        return GitHubClient(token, repo_name, api_url, store)
+    
+    from .dashboard_fixtures import FixtureSource, start_fixture_server
+    
+    source = FixtureSource(fixtures, repo_name)
+    if kind == 'replay':
+        return source
+    
+    _, url = start_fixture_server(source)
+    return GitHubClient(None, repo_name, url, store)
+
+TEMPLATE_DIR = os.path.join('.github', 'templates')
+DASHBOARD_TEMPLATE = 'dashboard_template.html'
+WORKFLOWS_DIR = os.path.join('.github', 'workflows')
+
+# Job steps are bucketed by the first pattern their name matches: setup
+# steps such as "Set up test environment" must not count as test time, and
+# "Post Setup Flutter" (cache teardown) is setup, not SDK installation
+STEP_CATEGORIES = (
+    ('flutter_sdk', re.compile(r'^(?!post ).*(flutter-action|setup flutter|install flutter)', re.IGNORECASE)),
+    ('pub_get', re.compile(r'pub get|install dependencies', re.IGNORECASE)),
+    ('setup', re.compile(r'^(set ?up|setup|checkout|run actions/checkout|cache|complete job|post )', re.IGNORECASE)),
+    ('test', re.compile(r'\btests?\b|coverage', re.IGNORECASE)),
+    ('build', re.compile(r'\bbuild\b', re.IGNORECASE))
+)
+STEP_CATEGORY_NAMES = tuple(category for category, _ in STEP_CATEGORIES) + ('other',)
+
+def compute_workflow_stats(df):
+    """
+    Aggregate per-workflow success rate, average duration and latest run.
+
+    Everything comes from one groupby over column vectors; duration is the
+    wall-clock time from run start (or creation) to last update of completed
+    runs, and queue time the wait from creation to run start, in seconds.
+    """
+    if df.empty:
+        return []
+    
+    import numpy as np
+    import pandas as pd
+    
+    completed = (df['status'] == 'completed').to_numpy()
+    started = df['run_started_at'].fillna(df['created_at']) if 'run_started_at' in df else df['created_at']
+    duration = (df['updated_at'] - started).dt.total_seconds().to_numpy()
+    
+    queue = (started - df['created_at']).dt.total_seconds().to_numpy()
+    
+    frame = pd.DataFrame({
+        'name': df['workflow_name'].to_numpy(),
+        'completed': completed,
+        'success': completed & (df['conclusion'] == 'success').to_numpy(),
+        'duration': np.where(completed, duration, np.nan),
+        'queue': queue,
+        'created_at': df['created_at'].to_numpy()
+    })
+    
+    grouped = frame.groupby('name', sort=True).agg(
+        completed=('completed', 'sum'),
+        successes=('success', 'sum'),
+        avg_duration=('duration', 'mean'),
+        avg_queue_time=('queue', 'mean'),
+        latest_index=('created_at', 'idxmax')
+    )
+    
+    # frame has a positional index, so idxmax gives row positions in df
+    latest = df.iloc[grouped['latest_index'].to_numpy()]
+    latest_status = np.where(
+        latest['status'].to_numpy() == 'completed',
+        latest['conclusion'].fillna('unknown').to_numpy(),
+        latest['status'].to_numpy()
+    )
+    success_rate = np.divide(
+        grouped['successes'].to_numpy() * 100.0,
+        grouped['completed'].to_numpy(),
+        out=np.zeros(len(grouped)),
+        where=grouped['completed'].to_numpy() > 0
+    )
+    
+    stats = pd.DataFrame({
+        'name': grouped.index.to_numpy(),
+        'success_rate': success_rate,
+        'avg_duration': grouped['avg_duration'].fillna(0).to_numpy(),
+        'avg_queue_time': grouped['avg_queue_time'].fillna(0).to_numpy(),
+        'latest_run_time': latest['created_at'].dt.strftime('%Y-%m-%d %H:%M').to_numpy(),
+        'latest_status': latest_status,
+        'latest_run_url': latest['run_url'].to_numpy()
+    })
+    return stats.to_dict('records')
+
+def compute_pr_stats(pr_df=None):
+    """
+    Summarise pull requests: open count, time to merge (mean and p50/p90),
+    time to first review, and the open PR list
+    """
+    stats = {
+        'open_count': 0,
+        'avg_merge_time': 0.0,
+        'merge_time_p50': 0.0,
+        'merge_time_p90': 0.0,
+        'review_latency_p50': 0.0,
+        'review_latency_p90': 0.0,
+        'unreviewed_open_count': 0,
+        'open_prs': []
+    }
+    if pr_df is None or pr_df.empty:
+        return stats
+    
+    import pandas as pd
+    
+    is_open = (pr_df['state'] == 'open').to_numpy()
+    merge_hours = ((pr_df['merged_at'] - pr_df['created_at']).dt.total_seconds() / 3600).dropna()
+    review_hours = ((pr_df['first_review_at'] - pr_df['created_at']).dt.total_seconds() / 3600).dropna()
+    
+    stats['open_count'] = int(is_open.sum())
+    if not merge_hours.empty:
+        stats['avg_merge_time'] = float(merge_hours.mean())
+        stats['merge_time_p50'], stats['merge_time_p90'] = (float(v) for v in merge_hours.quantile([0.5, 0.9]))
+    if not review_hours.empty:
+        stats['review_latency_p50'], stats['review_latency_p90'] = (float(v) for v in review_hours.quantile([0.5, 0.9]))
+    stats['unreviewed_open_count'] = int((is_open & pr_df['first_review_at'].isna().to_numpy()).sum())
+    
+    open_prs = pr_df.loc[is_open].sort_values('created_at', ascending=False)
+    stats['open_prs'] = pd.DataFrame({
+        'number': open_prs['number'].to_numpy(),
+        'title': open_prs['title'].to_numpy(),
+        'author': open_prs['author'].to_numpy(),
+        'url': open_prs['url'].to_numpy(),
+        'created_at': open_prs['created_at'].dt.strftime('%Y-%m-%d').to_numpy()
+    }).to_dict('records')
+    return stats
+
+def step_category(step_name):
+    """Bucket a job step by what it spends time on"""
+    for category, pattern in STEP_CATEGORIES:
+        if pattern.search(step_name or ''):
+            return category
+    return 'other'
+
+def flutter_cache_flags(workflows_dir=WORKFLOWS_DIR):
+    """
+    Map workflow file names to whether their flutter-action steps enable the
+    SDK cache: True (all), False (none) or None (mixed)
+    """
+    flags = {}
+    if not os.path.isdir(workflows_dir):
+        return flags
+    
+    for file_name in os.listdir(workflows_dir):
+        if not file_name.endswith(('.yml', '.yaml')):
+            continue
+        with open(os.path.join(workflows_dir, file_name), 'r') as f:
+            text = f.read()
+        # Each flutter-action step up to the next step
+        steps = re.findall(r'uses:\s*subosito/flutter-action[^\n]*\n((?:(?!\s*-\s).*\n?)*)', text)
+        if not steps:
+            continue
+        cached = [bool(re.search(r'^\s*cache:\s*true\b', step, re.MULTILINE)) for step in steps]
+        flags[file_name] = True if all(cached) else False if not any(cached) else None
+    return flags
+
+def compute_timing_stats(jobs_df, steps_df, cache_flags=None):
+    """
+    Break CI time down per workflow into queue, Flutter SDK setup, pub get,
+    other setup, test, build and remaining step time, plus CI minutes by
+    runner label and an estimate of what the flutter-action cache saves.
+
+    Category times are summed per job and averaged over jobs, so a step that
+    only some jobs run still shows its share of the time.
+    """
+    stats = {'workflows': [], 'runners': [], 'category_minutes': {}, 'flutter_cache': None}
+    if jobs_df is None or jobs_df.empty:
+        return stats
+    
+    import pandas as pd
+    
+    jobs = pd.DataFrame({
+        'job_id': jobs_df['job_id'].to_numpy(),
+        'workflow': jobs_df['workflow_name'].to_numpy(),
+        'file': jobs_df['workflow_path'].fillna('').str.split('@').str[0].str.rsplit('/', n=1).str[-1].to_numpy(),
+        'queue': (jobs_df['started_at'] - jobs_df['created_at']).dt.total_seconds().to_numpy(),
+        'duration': (jobs_df['completed_at'] - jobs_df['started_at']).dt.total_seconds().to_numpy(),
+        'labels': jobs_df['labels'].to_numpy()
+    })
+    
+    # Seconds per job and category
+    step_seconds = (steps_df['completed_at'] - steps_df['started_at']).dt.total_seconds()
+    per_job = pd.DataFrame({
+        'job_id': steps_df['job_id'].to_numpy(),
+        'category': steps_df['step_name'].map(step_category).to_numpy(),
+        'seconds': step_seconds.to_numpy()
+    }).dropna().pivot_table(index='job_id', columns='category', values='seconds', aggfunc='sum', fill_value=0)
+    per_job = per_job.reindex(columns=list(STEP_CATEGORY_NAMES), fill_value=0)
+    jobs = jobs.join(per_job, on='job_id')
+    
+    grouped = jobs.groupby('workflow', sort=True)
+    means = grouped[['queue'] + list(STEP_CATEGORY_NAMES)].mean()
+    minutes = grouped['duration'].sum() / 60
+    workflows = means.assign(jobs=grouped.size(), ci_minutes=minutes).sort_values('ci_minutes', ascending=False)
+    workflows = workflows.fillna(0).reset_index().rename(columns={'workflow': 'name'})
+    stats['workflows'] = workflows.to_dict('records')
+    
+    stats['category_minutes'] = {
+        category: float(jobs[category].sum() / 60) for category in STEP_CATEGORY_NAMES
+    }
+    
+    # A job's minutes count towards every label of its runner, so the rows
+    # overlap and add up to more than the total
+    runners = jobs[['duration']].assign(
+        label=jobs['labels'].map(lambda labels: json.loads(labels or '[]') or ['unknown'])
+    ).explode('label').groupby('label').agg(jobs=('duration', 'size'), ci_minutes=('duration', 'sum'))
+    runners['ci_minutes'] /= 60
+    stats['runners'] = runners.sort_values('ci_minutes', ascending=False).reset_index().to_dict('records')
+    
+    if cache_flags:
+        flag = jobs['file'].map(cache_flags)
+        cached = jobs.loc[flag.eq(True), 'flutter_sdk'].dropna()
+        uncached = jobs.loc[flag.eq(False), 'flutter_sdk'].dropna()
+        if not cached.empty and not uncached.empty:
+            saving = max(0.0, float(uncached.median() - cached.median()))
+            stats['flutter_cache'] = {
+                'cached_p50': float(cached.median()),
+                'uncached_p50': float(uncached.median()),
+                'uncached_jobs': int(len(uncached)),
+                'estimated_minutes_saved': saving * len(uncached) / 60,
+                'uncached_workflows': sorted(set(jobs.loc[flag.eq(False), 'workflow']))
+            }
+    
+    return stats
+
+def render_dashboard(workflow_stats, pr_stats, chart_files, output_file='dashboard/index.html', timing_stats=None):
+    """Render dashboard_template.html with the computed statistics"""
+    import jinja2
+    
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        autoescape=jinja2.select_autoescape(['html'])
+    )
+    html = env.get_template(DASHBOARD_TEMPLATE).render(
+        timestamp=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        chart_files=chart_files,
+        workflow_stats=workflow_stats,
+        pr_stats=pr_stats,
+        timing_stats=timing_stats or compute_timing_stats(None, None)
+    )
+    
+    with open(output_file, 'w') as f:
+        f.write(html)
+
+CHART_CACHE_DIR = os.path.join('.github', 'cache', 'charts')
+CHART_FORMATS = ('png', 'svg', 'inline')
+TIMELINE_COLORS = {'success': 'green', 'failure': 'red', 'skipped': 'gray'}
+
+def use_agg_backend():
+    """Select the non-interactive Agg backend and return pyplot"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def generate_workflow_status_chart(data, output_file):
+    """Create a pie chart of workflow statuses"""
+    plt = use_agg_backend()
+    plt.figure(figsize=(10, 6))
+    plt.pie(data['counts'], labels=data['labels'], autopct='%1.1f%%')
+    plt.title('GitHub Actions Workflow Statuses')
+    plt.tight_layout()
+    plt.savefig(output_file)
+    plt.close()
+    return output_file
+
+def generate_workflow_timeline(data, output_file):
+    """Create a timeline of workflow runs"""
+    plt = use_agg_backend()
+    plt.figure(figsize=(12, 6))
+    # Rasterize the points so SVG output stays small on long histories
+    plt.scatter(data['created_at'], data['run_number'], c=data['colors'], s=8, rasterized=True)
+    plt.title('Workflow Runs Timeline')
+    plt.xlabel('Date')
+    plt.ylabel('Run Number')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(output_file)
+    plt.close()
+    return output_file
+
+CHART_RENDERERS = {
+    'workflow_status': generate_workflow_status_chart,
+    'workflow_timeline': generate_workflow_timeline
+}
+
+def chart_inputs(df):
+    """Extract the (picklable) data each chart is drawn from"""
+    if df.empty:
+        return {}
+    
+    status_counts = df['conclusion'].value_counts()
+    df_sorted = df.sort_values('created_at')
+    
+    return {
+        'workflow_status': {
+            'labels': status_counts.index.to_numpy(dtype=object),
+            'counts': status_counts.to_numpy()
+        },
+        'workflow_timeline': {
+            'created_at': df_sorted['created_at'].dt.tz_localize(None).to_numpy(),
+            'run_number': df_sorted['run_number'].to_numpy(),
+            'colors': df_sorted['conclusion'].map(TIMELINE_COLORS).fillna('gray').to_numpy(dtype=object)
+        }
+    }
+
+def hash_chart_data(name, data, fmt):
+    """Fingerprint a chart's input so unchanged charts are not redrawn"""
+    import hashlib
+    
+    digest = hashlib.sha1(f'{name}:{fmt}'.encode('utf-8'))
+    for key in sorted(data):
+        values = data[key]
+        digest.update(key.encode('utf-8'))
+        if values.dtype == object:
+            digest.update('\0'.join(map(str, values)).encode('utf-8'))
+        else:
+            digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def render_charts(df, fmt='png', max_workers=2, cache_dir=CHART_CACHE_DIR, output_dir='dashboard'):
+    """
+    Render the dashboard charts and return their image sources for the template.
+
+    Charts whose input hash matches the previous build are copied from
+    cache_dir; the rest are drawn in a process pool with the Agg backend.
+    'inline' embeds SVG as data URIs instead of writing image files.
+    """
+    import base64
+    import shutil
+    from concurrent.futures import ProcessPoolExecutor
+    
+    extension = 'svg' if fmt == 'inline' else fmt
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    inputs = chart_inputs(df)
+    cached_files = {}
+    pending = {}
+    for name, data in inputs.items():
+        cached_file = os.path.join(cache_dir, f'{name}.{extension}')
+        hash_file = cached_file + '.sha1'
+        digest = hash_chart_data(name, data, extension)
+        cached_files[name] = cached_file
+        
+        if os.path.exists(cached_file) and os.path.exists(hash_file):
+            with open(hash_file, 'r') as f:
+                if f.read().strip() == digest:
+                    continue
+        pending[name] = (data, digest)
+    
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            futures = {
+                name: executor.submit(CHART_RENDERERS[name], data, cached_files[name])
+                for name, (data, _) in pending.items()
+            }
+            for name, future in futures.items():
+                try:
+                    future.result()
+                    with open(cached_files[name] + '.sha1', 'w') as f:
+                        f.write(pending[name][1])
+                except Exception as e:
+                    print(f"Error generating {name} chart: {e}")
+                    cached_files.pop(name)
+    
+    print(f"Charts: {len(pending)} rendered, {len(inputs) - len(pending)} unchanged")
+    
+    chart_sources = []
+    for name, cached_file in cached_files.items():
+        if fmt == 'inline':
+            with open(cached_file, 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode('ascii')
+            chart_sources.append(f'data:image/svg+xml;base64,{encoded}')
+        else:
+            file_name = os.path.basename(cached_file)
+            shutil.copy(cached_file, os.path.join(output_dir, file_name))
+            chart_sources.append(file_name)
+    
+    return chart_sources
+
+def generate_dashboard(actions_df, pr_df=None, chart_format='png', chart_workers=2, job_dfs=None):
+    """Generate the complete dashboard; job_dfs is the (jobs, steps) pair for timing stats"""
+    # Setup dashboard directory
+    setup_environment()
+    
+    # Generate charts
+    chart_files = render_charts(actions_df, chart_format, chart_workers)
+    
+    try:
+        timing_stats = compute_timing_stats(*job_dfs, flutter_cache_flags()) if job_dfs else None
+        render_dashboard(
+            compute_workflow_stats(actions_df), compute_pr_stats(pr_df), chart_files,
+            timing_stats=timing_stats
+        )
+    except Exception as e:
+        print(f"Error rendering dashboard template: {e}")
+        
+        # Create a simple HTML fallback if rendering fails
+        with open('dashboard/index.html', 'w') as f:
+            f.write("""
+            <!DOCTYPE html>
+            <html>
+            <head><title>FootballHero CI/CD Dashboard</title></head>
+            <body>
+                <h1>FootballHero CI/CD Dashboard</h1>
+                <p>Dashboard generation in progress...</p>
+            </body>
+            </html>
+            """)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the CI/CD dashboard')
+    parser.add_argument('--since', default=DEFAULT_SINCE,
+                        help=f"Oldest runs to include, as '<days>d' or an ISO date (default: {DEFAULT_SINCE})")
+    parser.add_argument('--max-runs', type=int, default=DEFAULT_MAX_RUNS,
+                        help=f'Maximum runs fetched per workflow and build, 0 for no limit; '
+                             f'older runs of the window are filled in by later builds (default: {DEFAULT_MAX_RUNS})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_FETCH_WORKERS,
+                        help=f'Workflows fetched concurrently (default: {DEFAULT_FETCH_WORKERS})')
+    parser.add_argument('--source', choices=['live', 'replay', 'server'], default='live',
+                        help='Data source: GitHub API, recorded fixtures, or fixtures behind a local API stand-in')
+    parser.add_argument('--fixtures', help='Fixture directory for the replay and server sources')
+    parser.add_argument('--api-url', default=GITHUB_API_URL,
+                        help=f'GitHub REST API base URL for the live source (default: {GITHUB_API_URL})')
+    parser.add_argument('--repo', default=REPO_NAME, help=f'Repository to report on (default: {REPO_NAME})')
+    parser.add_argument('--cache-file',
+                        help=f'Local run store synced incrementally (default: {RUN_CACHE_FILE} for the live source)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Fetch the whole window into a throwaway store instead of the local run store')
+    parser.add_argument('--chart-format', choices=CHART_FORMATS, default='png',
+                        help='Chart output: PNG files, SVG files, or SVG inlined into index.html (default: png)')
+    parser.add_argument('--no-pulls', action='store_true', help='Skip pull request statistics')
+    parser.add_argument('--max-job-runs', type=int, default=DEFAULT_MAX_JOB_RUNS,
+                        help=f'Completed runs whose jobs and steps are fetched per build, 0 to skip (default: {DEFAULT_MAX_JOB_RUNS})')
+    args = parser.parse_args(argv)
+    
+    # Get GitHub token from environment
+    github_token = os.environ.get('GITHUB_TOKEN')
+    if args.source == 'live' and args.api_url == GITHUB_API_URL and not github_token:
+        print("Error: GITHUB_TOKEN environment variable not set")
+        sys.exit(1)
+    
+    if args.source != 'live' and not args.fixtures:
+        print(f"Error: --fixtures is required for the {args.source} source")
+        sys.exit(1)
+    
+    since = parse_since(args.since)
+    workers = max(1, args.workers)
+    
+    # Offline sources must not mix into the real run store unless asked to
+    cache_file = args.cache_file or (RUN_CACHE_FILE if args.source == 'live' else ':memory:')
+    if args.no_cache:
+        cache_file = ':memory:'
+    
+    store = RunStore(cache_file)
+    source = None
+    try:
+        source = create_data_source(
+            args.source, github_token, args.fixtures, args.api_url, args.repo, store
+        )
+        sync_workflow_runs(source, store, since, args.max_runs, workers)
+    except Exception as e:
+        print(f"Error syncing workflow runs, using cached data: {e}")
+    
+    if source is not None and args.max_job_runs > 0:
+        try:
+            fetched = sync_run_jobs(source, store, since, args.max_job_runs, workers)
+            print(f"Fetched jobs for {fetched} runs")
+        except Exception as e:
+            print(f"Error syncing jobs, using cached data: {e}")
+    
+    if source is not None and not args.no_pulls:
+        try:
+            synced = sync_pull_requests(source, store, since)
+            print(f"Synced {synced} updated pull requests")
+        except Exception as e:
+            print(f"Error syncing pull requests, using cached data: {e}")
+    
+    if isinstance(source, GitHubClient):
+        print(f"GitHub API requests: {source.request_count}")
+    store.prune_http_cache()
+    
+    actions_df = store.load_dataframe(since)
+    pr_df = None if args.no_pulls else store.load_pull_dataframe(since)
+    job_dfs = store.load_job_dataframes(since)
+    store.close()
+    
+    generate_dashboard(actions_df, pr_df, chart_format=args.chart_format, job_dfs=job_dfs)
+    print("Dashboard generated successfully in 'dashboard' directory")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1372 @@
+#!/usr/bin/env python3
+# metrics_collector.py - Collects and processes metrics from CI/CD runs
+
+import os
+import sys
+import json
+import datetime
+import heapq
+import argparse
+from pathlib import Path
+
+from .component_matcher import ComponentMatcher
+from .report_template import load_template, render_template
+
+COMPONENT_MAP_PATH = '.github/config/ci_component_map.json'
+UNMAPPED_COMPONENT = 'unmapped'
+METRICS_HISTORY_FILE = os.path.join('.github', 'cache', 'metrics_history.ndjson')
+# DA lines sorted in memory at a time when merging unsorted coverage shards
+LCOV_SORT_CHUNK = 200000
+
+# Scalar metrics kept in the history, and whether higher values are worse
+TRACKED_METRICS = {
+    'test.total_coverage': False,
+    'dependency.outdated_packages': True,
+    'dependency.major_updates': True,
+    'build.total_build_time': True,
+    'build.compile_time': True,
+    'build.asset_processing_time': True,
+    'performance.time_to_first_frame_ms': True,
+    'performance.frame_build_p90_ms': True,
+    'performance.frame_raster_p90_ms': True,
+    'performance.peak_memory_mb': True
+}
+# Metrics checked for regressions against their rolling history
+REGRESSION_METRICS = (
+    'build.total_build_time',
+    'build.compile_time',
+    'test.total_coverage',
+    'performance.time_to_first_frame_ms'
+)
+# Dependency update types from least to most disruptive
+UPDATE_TYPES = ('patch', 'minor', 'major')
+# Artifact file names looked up in each snapshot directory in batch mode
+BATCH_ARTIFACT_NAMES = {
+    'coverage': ('lcov.info', os.path.join('coverage', 'lcov.info'), 'coverage.json'),
+    'dependencies': ('outdated_packages.json',),
+    'dependency_tree': ('dependency_tree.txt',),
+    'performance': ('build_performance.json',)
+}
+
+def load_component_map(map_path=COMPONENT_MAP_PATH):
+    """Load the component mapping configuration"""
+    if not os.path.exists(map_path):
+        print(f"Warning: Component map {map_path} not found")
+        return {}
+    
+    try:
+        with open(map_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading component map: {e}")
+        return {}
+
+def normalize_source_path(source_file):
+    """Make coverage paths comparable with the repo-relative component paths"""
+    source_file = source_file.replace('\\', '/')
+    if source_file.startswith('./'):
+        source_file = source_file[2:]
+    
+    # Absolute paths from CI runners: keep everything from the lib/ or test/ root
+    if source_file.startswith('/'):
+        for root in ('/lib/', '/test/'):
+            index = source_file.rfind(root)
+            if index != -1:
+                return source_file[index + 1:]
+    
+    return source_file
+
+def iter_lcov_records(coverage_file):
+    """
+    Stream (source_file, lines_found, lines_hit) records from an LCOV tracefile.
+
+    The file is read line by line so memory use stays flat regardless of the
+    report size. LF/LH summary lines are used when present, otherwise the
+    counts are derived from the DA lines of the record.
+    """
+    source_file = None
+    da_found = da_hit = 0
+    lf = lh = None
+
+    with open(coverage_file, 'r') as f:
+        for line in f:
+            if line.startswith('DA:'):
+                # DA:<line>,<hits>[,<checksum>]
+                fields = line[3:].split(',', 2)
+                if len(fields) >= 2:
+                    da_found += 1
+                    try:
+                        if int(fields[1]) > 0:
+                            da_hit += 1
+                    except ValueError:
+                        pass
+            elif line.startswith('SF:'):
+                source_file = line[3:].strip()
+                da_found = da_hit = 0
+                lf = lh = None
+            elif line.startswith('LF:'):
+                lf = int(line[3:])
+            elif line.startswith('LH:'):
+                lh = int(line[3:])
+            elif line.startswith('end_of_record'):
+                if source_file is not None:
+                    found = lf if lf is not None else da_found
+                    hit = lh if lh is not None else da_hit
+                    yield source_file, found, hit
+                source_file = None
+                da_found = da_hit = 0
+                lf = lh = None
+
+def iter_json_coverage_records(coverage_file):
+    """
+    Yield (source_file, lines_found, lines_hit) records from a JSON coverage dict
+    """
+    with open(coverage_file, 'r') as f:
+        coverage_data = json.load(f)
+
+    for source_file, file_data in coverage_data.get('coverage', {}).items():
+        file_total = sum(1 for hit in file_data.values() if hit is not None)
+        file_covered = sum(1 for hit in file_data.values() if hit is not None and hit > 0)
+        yield source_file, file_total, file_covered
+
+def iter_coverage_records(coverage_file):
+    """
+    Pick a coverage reader based on the file extension
+    """
+    if Path(coverage_file).suffix.lower() in ('.info', '.lcov'):
+        return iter_lcov_records(coverage_file)
+    return iter_json_coverage_records(coverage_file)
+
+def iter_lcov_line_hits(coverage_file):
+    """
+    Stream (source_file, line_number, hits) tuples from the DA lines of an LCOV file
+    """
+    source_file = None
+    
+    with open(coverage_file, 'r') as f:
+        for line in f:
+            if line.startswith('DA:'):
+                fields = line[3:].split(',', 2)
+                if source_file is not None and len(fields) >= 2:
+                    yield source_file, int(fields[0]), int(fields[1])
+            elif line.startswith('SF:'):
+                source_file = line[3:].strip()
+            elif line.startswith('end_of_record'):
+                source_file = None
+
+def is_lcov_sorted(coverage_file):
+    """Check whether an LCOV file is ordered by source file and line number"""
+    previous = None
+    
+    for source_file, line_number, _ in iter_lcov_line_hits(coverage_file):
+        key = (source_file, line_number)
+        if previous is not None and key <= previous:
+            return False
+        previous = key
+    
+    return True
+
+def write_lcov(line_hits, output_file):
+    """
+    Write sorted (source_file, line_number, hits) tuples as LCOV records,
+    summing the hits of consecutive duplicates
+    """
+    with open(output_file, 'w') as out:
+        current_file = None
+        current_line = None
+        current_hits = 0
+        found = hit = 0
+        
+        def flush_line():
+            nonlocal found, hit
+            if current_line is not None:
+                out.write(f"DA:{current_line},{current_hits}\n")
+                found += 1
+                if current_hits > 0:
+                    hit += 1
+        
+        def flush_record():
+            nonlocal found, hit
+            if current_file is not None:
+                out.write(f"LF:{found}\nLH:{hit}\nend_of_record\n")
+            found = hit = 0
+        
+        for source_file, line_number, hits in line_hits:
+            if source_file == current_file and line_number == current_line:
+                current_hits += hits
+                continue
+            
+            flush_line()
+            if source_file != current_file:
+                flush_record()
+                current_file = source_file
+                out.write(f"SF:{source_file}\n")
+            current_line = line_number
+            current_hits = hits
+        
+        flush_line()
+        flush_record()
+
+def spill_sorted_runs(coverage_file, temp_dir=None, chunk_size=LCOV_SORT_CHUNK):
+    """
+    Split an unsorted LCOV file into sorted temporary LCOV files of at most
+    chunk_size lines each and return their paths.
+
+    Only one chunk is held in memory at a time; the runs are combined later
+    by the same heap merge as sorted shards.
+    """
+    import tempfile
+    
+    runs = []
+    chunk = []
+    
+    def spill():
+        fd, run_file = tempfile.mkstemp(suffix='.info', dir=temp_dir)
+        os.close(fd)
+        runs.append(run_file)
+        chunk.sort()
+        write_lcov(chunk, run_file)
+        chunk.clear()
+    
+    try:
+        for line_hit in iter_lcov_line_hits(coverage_file):
+            chunk.append(line_hit)
+            if len(chunk) >= chunk_size:
+                spill()
+        if chunk:
+            spill()
+    except Exception:
+        for run_file in runs:
+            os.remove(run_file)
+        raise
+    
+    return runs
+
+def merge_lcov_files(shard_files, output_file):
+    """
+    Merge LCOV shards into one report by summing hit counts per file and line.
+
+    Shards are combined with a k-way heap merge over sorted records.
+    flutter test shards are usually not sorted by source file; those are
+    first split into sorted runs of LCOV_SORT_CHUNK lines spilled to
+    temporary files, so memory is bounded by one chunk plus one record per
+    run. The output is written next to its final location and moved into
+    place, so it may also be one of the shards.
+    """
+    import tempfile
+    
+    shard_files = [f for f in shard_files if os.path.exists(f)]
+    output_dir = os.path.dirname(output_file) or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    fd, merged_file = tempfile.mkstemp(suffix='.info', dir=output_dir)
+    os.close(fd)
+    temp_files = [merged_file]
+    
+    try:
+        sorted_runs = []
+        for shard_file in shard_files:
+            if is_lcov_sorted(shard_file):
+                sorted_runs.append(shard_file)
+                continue
+            runs = spill_sorted_runs(shard_file)
+            temp_files.extend(runs)
+            sorted_runs.extend(runs)
+        
+        write_lcov(heapq.merge(*(iter_lcov_line_hits(f) for f in sorted_runs)), merged_file)
+        os.replace(merged_file, output_file)
+    finally:
+        for temp_file in temp_files:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+    
+    return output_file
+
+def collect_test_metrics(coverage_file, component_map=None, top_uncovered=20):
+    """
+    Parse and collect test coverage metrics from coverage report
+
+    Accepts either an LCOV tracefile (coverage/lcov.info) or a JSON coverage dict.
+    Totals, per-component coverage and the least-covered files are gathered in a
+    single pass over the report.
+    """
+    metrics = {
+        "total_coverage": 0,
+        "coverage_by_package": {},
+        "uncovered_files": []
+    }
+    
+    if not os.path.exists(coverage_file):
+        print(f"Warning: Coverage file {coverage_file} not found")
+        return metrics
+    
+    if component_map is None:
+        component_map = load_component_map()
+    matcher = ComponentMatcher(component_map)
+    
+    try:
+        # Extract overall coverage
+        total_lines = 0
+        covered_lines = 0
+        package_totals = {}
+        # Max-heap (by negated coverage) holding the N least-covered files
+        least_covered = []
+        
+        for source_file, file_total, file_covered in iter_coverage_records(coverage_file):
+            total_lines += file_total
+            covered_lines += file_covered
+            
+            if file_total <= 0:
+                continue
+            
+            source_file = normalize_source_path(source_file)
+            for component in matcher.match(source_file) or [UNMAPPED_COMPONENT]:
+                totals = package_totals.setdefault(component, [0, 0])
+                totals[0] += file_total
+                totals[1] += file_covered
+            
+            if file_covered < file_total and top_uncovered > 0:
+                entry = (-(file_covered / file_total), source_file, file_total, file_covered)
+                if len(least_covered) < top_uncovered:
+                    heapq.heappush(least_covered, entry)
+                elif entry > least_covered[0]:
+                    heapq.heapreplace(least_covered, entry)
+        
+        if total_lines > 0:
+            metrics["total_coverage"] = round((covered_lines / total_lines) * 100, 2)
+        
+        for component, (found, hit) in sorted(package_totals.items()):
+            metrics["coverage_by_package"][component] = {
+                "coverage": round((hit / found) * 100, 2),
+                "lines_found": found,
+                "lines_hit": hit
+            }
+        
+        for ratio, source_file, found, hit in sorted(least_covered, reverse=True):
+            metrics["uncovered_files"].append({
+                "file": source_file,
+                "coverage": round(-ratio * 100, 2),
+                "lines_found": found,
+                "uncovered_lines": found - hit
+            })
+            
+    except Exception as e:
+        print(f"Error parsing coverage data: {e}")
+    
+    return metrics
+
+def parse_pub_version(version):
+    """
+    Parse a pub/semver version such as '1.2.3-dev.1+4' into
+    (major, minor, patch, pre-release, build) or None when unparseable
+    """
+    if not isinstance(version, str):
+        return None
+    version = version.strip().lstrip('^=v*')
+    core, _, build = version.partition('+')
+    core, _, pre = core.partition('-')
+    numbers = core.split('.')
+    if len(numbers) != 3 or not all(part.isdigit() for part in numbers):
+        return None
+    
+    def identifiers(text):
+        # Numeric identifiers sort numerically and before alphanumeric ones
+        return tuple((0, int(part), '') if part.isdigit() else (1, 0, part)
+                     for part in text.split('.') if part)
+    
+    return (int(numbers[0]), int(numbers[1]), int(numbers[2]), identifiers(pre), identifiers(build))
+
+def version_sort_key(parsed):
+    """
+    Ordering key following pub's rules: a pre-release sorts before its
+    release, and a build suffix sorts after the plain version
+    """
+    major, minor, patch, pre, build = parsed
+    return (major, minor, patch, (1,) if not pre else (0,) + pre, (0,) if not build else (1,) + build)
+
+def compare_versions(a, b):
+    """Compare two version strings; returns -1, 0 or 1, or None if either is unparseable"""
+    parsed_a, parsed_b = parse_pub_version(a), parse_pub_version(b)
+    if parsed_a is None or parsed_b is None:
+        return None
+    key_a, key_b = version_sort_key(parsed_a), version_sort_key(parsed_b)
+    return (key_a > key_b) - (key_a < key_b)
+
+def classify_update(current, latest):
+    """
+    Classify the update from current to latest as 'major', 'minor' or 'patch'.
+
+    Follows pub's convention that for 0.x versions the minor number is the
+    breaking one. Returns None when there is no newer version or a version
+    cannot be parsed.
+    """
+    parsed_current, parsed_latest = parse_pub_version(current), parse_pub_version(latest)
+    if parsed_current is None or parsed_latest is None:
+        return None
+    if version_sort_key(parsed_latest) <= version_sort_key(parsed_current):
+        return None
+    if parsed_latest[0] != parsed_current[0]:
+        return 'major'
+    if parsed_latest[1] != parsed_current[1]:
+        return 'major' if parsed_current[0] == 0 else 'minor'
+    if parsed_latest[2] != parsed_current[2] and parsed_current[0] == 0 and parsed_current[1] == 0:
+        return 'major'
+    return 'patch'
+
+def iter_outdated_packages(outdated_file):
+    """
+    Yield {name, kind, current, upgradable, resolvable, latest, discontinued}
+    records from 'flutter pub outdated --json' output.
+
+    Falls back to the plain-text table when the file is not JSON.
+    """
+    with open(outdated_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    def version_of(entry):
+        return entry.get('version') if isinstance(entry, dict) else entry
+    
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        data = None
+    
+    if isinstance(data, dict):
+        for package in data.get('packages', []):
+            yield {
+                "name": package.get('package'),
+                "kind": package.get('kind', 'direct'),
+                "current": version_of(package.get('current')),
+                "upgradable": version_of(package.get('upgradable')),
+                "resolvable": version_of(package.get('resolvable')),
+                "latest": version_of(package.get('latest')),
+                "discontinued": bool(package.get('isDiscontinued'))
+            }
+        return
+    
+    # Text output: "Package Name  Current  Upgradable  Resolvable  Latest"
+    # rows grouped under "direct dependencies:" style headings
+    kind = 'direct'
+    in_table = False
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('Package Name'):
+            in_table = True
+            continue
+        if not in_table or not stripped:
+            continue
+        if stripped.endswith('dependencies:'):
+            heading = stripped[:-len('dependencies:')].strip()
+            kind = 'transitive' if 'transitive' in heading else 'dev' if 'dev' in heading else 'direct'
+            continue
+        parts = [part.lstrip('*') for part in stripped.replace('|', ' ').split()]
+        if len(parts) < 5:
+            continue
+        yield {
+            "name": parts[0],
+            "kind": kind,
+            "current": parts[1],
+            "upgradable": parts[2],
+            "resolvable": parts[3],
+            "latest": parts[4],
+            "discontinued": '(discontinued' in stripped
+        }
+
+def load_dependency_graph(deps_file):
+    """
+    Load the package graph from 'flutter pub deps' output (tree or --json).
+
+    Returns (root, direct, graph) where direct is the set of the root's
+    direct and dev dependencies and graph maps each package to the set of
+    packages it depends on.
+    """
+    with open(deps_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    graph = {}
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        data = None
+    
+    if isinstance(data, dict):
+        root = data.get('root')
+        for package in data.get('packages', []):
+            graph[package['name']] = set(package.get('dependencies', []))
+        root_entry = next((p for p in data.get('packages', []) if p.get('name') == root), {})
+        direct = set(root_entry.get('directDependencies', [])) | set(root_entry.get('devDependencies', []))
+        return root, direct or graph.get(root, set()), graph
+    
+    # Tree output: four columns of '│   ' / '├── ' per level; repeated
+    # subtrees are abbreviated as 'name...'
+    root = None
+    stack = []
+    for line in content.splitlines():
+        if not line.strip() or line.startswith(('Dart SDK', 'Flutter SDK')):
+            continue
+        position = next((i for i, char in enumerate(line) if char.isalnum() or char == '_'), None)
+        if position is None:
+            continue
+        depth = position // 4
+        name = line[position:].split()[0].rstrip('.')
+        if depth == 0:
+            root = name
+            stack = [name]
+            graph.setdefault(name, set())
+            continue
+        
+        del stack[depth:]
+        if stack:
+            graph.setdefault(stack[-1], set()).add(name)
+        graph.setdefault(name, set())
+        stack.append(name)
+    
+    return root, graph.get(root, set()), graph
+
+def compute_transitive_staleness(outdated, root, direct, graph):
+    """
+    Attribute outdated transitive packages to the direct dependencies that
+    pull them in, with their depth below the root
+    """
+    # Shortest depth of every package below the root
+    depth = {root: 0}
+    queue = [root]
+    for package in queue:
+        for dependency in graph.get(package, ()):
+            if dependency not in depth:
+                depth[dependency] = depth[package] + 1
+                queue.append(dependency)
+    
+    stale_transitive = {pkg['name']: pkg for pkg in outdated if pkg['kind'] == 'transitive'}
+    by_direct = []
+    for direct_dependency in sorted(direct):
+        seen = {direct_dependency}
+        stack = [direct_dependency]
+        stale = []
+        while stack:
+            for dependency in graph.get(stack.pop(), ()):
+                if dependency not in seen:
+                    seen.add(dependency)
+                    stack.append(dependency)
+                    if dependency in stale_transitive and dependency not in direct:
+                        stale.append(dependency)
+        if stale:
+            updates = [stale_transitive[name]['update'] for name in stale]
+            by_direct.append({
+                "name": direct_dependency,
+                "stale_transitive": len(stale),
+                "major_updates": updates.count('major'),
+                "packages": sorted(stale)
+            })
+    
+    by_direct.sort(key=lambda entry: (-entry['major_updates'], -entry['stale_transitive'], entry['name']))
+    stale_depths = [depth[name] for name in stale_transitive if name in depth]
+    return {
+        "stale_packages": len(stale_transitive),
+        "max_depth": max(stale_depths, default=0),
+        "mean_depth": round(sum(stale_depths) / len(stale_depths), 2) if stale_depths else 0,
+        "by_direct_dependency": by_direct
+    }
+
+def collect_dependency_metrics(outdated_file, deps_file=None):
+    """
+    Collect dependency metrics from 'flutter pub outdated --json' output,
+    optionally attributing stale transitive packages using 'flutter pub deps'
+    """
+    metrics = {
+        "outdated_packages": 0,
+        "major_updates": 0,
+        "minor_updates": 0,
+        "patch_updates": 0,
+        "direct_outdated": 0,
+        "transitive_outdated": 0,
+        "discontinued_packages": 0,
+        "blocked_updates": 0,
+        "packages": []
+    }
+    
+    if not os.path.exists(outdated_file):
+        print(f"Warning: Outdated packages file {outdated_file} not found")
+        return metrics
+    
+    try:
+        for package in iter_outdated_packages(outdated_file):
+            update = classify_update(package['current'], package['latest'])
+            if package['discontinued']:
+                metrics["discontinued_packages"] += 1
+            if update is None and not package['discontinued']:
+                continue
+            
+            package['update'] = update
+            metrics["outdated_packages"] += 1
+            if update:
+                metrics[f"{update}_updates"] += 1
+            if package['kind'] == 'transitive':
+                metrics["transitive_outdated"] += 1
+            else:
+                metrics["direct_outdated"] += 1
+            # Latest is out of reach of the current constraints of other packages
+            if update and compare_versions(package['resolvable'], package['latest']) == -1:
+                metrics["blocked_updates"] += 1
+            metrics["packages"].append(package)
+    except (OSError, UnicodeDecodeError, AttributeError, TypeError) as e:
+        print(f"Error parsing dependency data: {e}")
+        return metrics
+    
+    # Most disruptive updates first, direct dependencies before transitive ones
+    metrics["packages"].sort(key=lambda pkg: (
+        -(UPDATE_TYPES.index(pkg['update']) + 1 if pkg['update'] else 0),
+        pkg['kind'] == 'transitive',
+        pkg['name'] or ''
+    ))
+    
+    if deps_file:
+        if not os.path.exists(deps_file):
+            print(f"Warning: Dependency tree file {deps_file} not found")
+        else:
+            try:
+                root, direct, graph = load_dependency_graph(deps_file)
+                metrics["transitive_staleness"] = compute_transitive_staleness(
+                    metrics["packages"], root, direct, graph
+                )
+            except (OSError, UnicodeDecodeError, KeyError, TypeError) as e:
+                print(f"Error parsing dependency tree: {e}")
+    
+    return metrics
+
+def phase_duration(phase):
+    """Elapsed milliseconds of a build phase, whichever key the tool used"""
+    for key in ('elapsedMilliseconds', 'elapsed_ms', 'time_ms', 'durationMillis'):
+        value = phase.get(key)
+        if isinstance(value, (int, float)):
+            return value
+    return None
+
+def build_phase_tree(phases):
+    """
+    Turn build phase records into a tree of
+    {name, total_ms, self_ms, children} nodes.
+
+    Phases may nest through 'children' lists or point at a 'parent' phase by
+    name. A phase without its own timing takes the sum of its children, and
+    self time is what the children do not account for.
+    """
+    def make_node(phase):
+        children = [make_node(child) for child in phase.get('children') or phase.get('phases') or []]
+        return {
+            'name': phase.get('name', 'Unknown'),
+            'parent': phase.get('parent'),
+            'elapsed': phase_duration(phase),
+            'children': children
+        }
+    
+    nodes = [make_node(phase) for phase in phases]
+    
+    # Attach phases that name their parent
+    by_name = {}
+    def index(node):
+        by_name.setdefault(node['name'], node)
+        for child in node['children']:
+            index(child)
+    for node in nodes:
+        index(node)
+    
+    roots = []
+    for node in nodes:
+        parent = by_name.get(node['parent']) if node['parent'] else None
+        if parent is not None and parent is not node:
+            parent['children'].append(node)
+        else:
+            roots.append(node)
+    
+    def finish(node):
+        children_total = sum(finish(child) for child in node['children'])
+        total = node.pop('elapsed')
+        if total is None:
+            total = children_total
+        node.pop('parent')
+        node['total_ms'] = total
+        node['self_ms'] = max(0, total - children_total)
+        return total
+    
+    for root in roots:
+        finish(root)
+    
+    return roots
+
+def iter_phase_paths(nodes, prefix=()):
+    """Yield (path tuple, node) for every node of a phase tree, depth first"""
+    for node in nodes:
+        path = prefix + (node['name'],)
+        yield path, node
+        yield from iter_phase_paths(node['children'], path)
+
+def critical_phase_path(roots):
+    """Follow the most expensive phase at every level, from the root down"""
+    path = []
+    nodes = roots
+    while nodes:
+        heaviest = max(nodes, key=lambda node: node['total_ms'])
+        path.append({'name': heaviest['name'], 'total_ms': heaviest['total_ms'], 'self_ms': heaviest['self_ms']})
+        nodes = heaviest['children']
+    return path
+
+def write_collapsed_stacks(roots, output_file):
+    """Write the phase tree as collapsed stacks ('a;b;c <self ms>') for flame graph tools"""
+    with open(output_file, 'w') as f:
+        for path, node in iter_phase_paths(roots):
+            if node['self_ms'] > 0:
+                f.write(';'.join(name.replace(';', ',') for name in path) + f" {int(round(node['self_ms']))}\n")
+
+def collect_build_metrics(performance_file, top_phases=10):
+    """
+    Parse performance metrics from build process
+    """
+    metrics = {
+        "total_build_time": 0,
+        "compile_time": 0,
+        "asset_processing_time": 0,
+        "stages": [],
+        "critical_path": [],
+        "slowest_phases": [],
+        "phase_tree": []
+    }
+    
+    if not os.path.exists(performance_file):
+        print(f"Warning: Performance file {performance_file} not found")
+        return metrics
+    
+    try:
+        with open(performance_file, 'r') as f:
+            data = json.load(f)
+        
+        # Flutter writes 'targets'; older reports used 'buildPerformance'
+        roots = build_phase_tree(data.get('buildPerformance') or data.get('targets') or [])
+        metrics["phase_tree"] = roots
+        
+        for root in roots:
+            metrics["stages"].append({
+                "name": root['name'],
+                "time_ms": root['total_ms']
+            })
+            metrics["total_build_time"] += root['total_ms']
+        
+        # Classify by self time so nested phases are not counted twice
+        slowest = []
+        for path, node in iter_phase_paths(roots):
+            name = node['name'].lower()
+            if 'compile' in name:
+                metrics["compile_time"] += node['self_ms']
+            elif 'asset' in name:
+                metrics["asset_processing_time"] += node['self_ms']
+            slowest.append((node['self_ms'], node['total_ms'], ' > '.join(path)))
+        
+        metrics["critical_path"] = critical_phase_path(roots)
+        metrics["slowest_phases"] = [
+            {"phase": path, "self_ms": self_ms, "total_ms": total_ms}
+            for self_ms, total_ms, path in heapq.nlargest(top_phases, slowest)
+        ]
+    
+    except Exception as e:
+        print(f"Error parsing build performance data: {e}")
+    
+    return metrics
+
+def flatten_metrics(metrics):
+    """Pick the tracked scalar metrics out of the nested metrics dict"""
+    values = {}
+    for key in TRACKED_METRICS:
+        category, name = key.split('.', 1)
+        value = metrics.get(category, {}).get(name)
+        if isinstance(value, (int, float)):
+            values[key] = value
+    return values
+
+def current_commit():
+    """Commit and branch of the current build, from the CI environment or git"""
+    commit = os.environ.get('GITHUB_SHA')
+    branch = os.environ.get('GITHUB_HEAD_REF') or os.environ.get('GITHUB_REF_NAME')
+    
+    if not commit or not branch:
+        import subprocess
+        
+        def git(*args):
+            result = subprocess.run(['git'] + list(args), capture_output=True, text=True)
+            return result.stdout.strip() if result.returncode == 0 else None
+        
+        commit = commit or git('rev-parse', 'HEAD')
+        branch = branch or git('rev-parse', '--abbrev-ref', 'HEAD')
+    
+    return commit, branch
+
+def append_history(metrics, history_file=METRICS_HISTORY_FILE, commit=None, branch=None, timestamp=None):
+    """
+    Append one record of the tracked metrics to the NDJSON history.
+
+    Records are only ever appended, in timestamp order, so recent records
+    can be read from the end of the file.
+    """
+    values = flatten_metrics(metrics)
+    if not values:
+        return None
+    
+    record = {
+        'timestamp': timestamp or datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'branch': branch,
+        'metrics': values
+    }
+    
+    os.makedirs(os.path.dirname(history_file) or '.', exist_ok=True)
+    with open(history_file, 'a') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    
+    return record
+
+def read_recent_history(history_file=METRICS_HISTORY_FILE, limit=50, block_size=65536):
+    """
+    Read the last `limit` records, oldest first, by scanning the file
+    backwards in blocks instead of reading the whole history
+    """
+    if not os.path.exists(history_file):
+        return []
+    
+    with open(history_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b''
+        lines = []
+        
+        while position > 0 and len(lines) <= limit:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+            lines = buffer.splitlines()
+        
+        # The first line may be cut in half unless we reached the file start
+        if position > 0:
+            lines = lines[1:]
+    
+    records = []
+    for line in lines[-limit:]:
+        if line.strip():
+            records.append(json.loads(line))
+    return records
+
+def detect_regressions(values, history, window=20, threshold=3.0, min_points=5, min_relative_change=0.02):
+    """
+    Flag metrics that moved beyond rolling median +/- threshold * MAD in the
+    worse direction.
+
+    The MAD is scaled by 1.4826 so the threshold is in standard deviations for
+    normally distributed noise. Changes smaller than min_relative_change of the
+    median are ignored so a perfectly flat history does not flag tiny jitter.
+    """
+    from statistics import median
+    
+    regressions = []
+    for key in REGRESSION_METRICS:
+        if key not in values:
+            continue
+        
+        previous = [record['metrics'][key] for record in history if key in record.get('metrics', {})]
+        previous = previous[-window:]
+        if len(previous) < min_points:
+            continue
+        
+        center = median(previous)
+        mad = 1.4826 * median(abs(value - center) for value in previous)
+        tolerance = max(threshold * mad, abs(center) * min_relative_change)
+        delta = values[key] - center
+        
+        worse = delta > tolerance if TRACKED_METRICS[key] else delta < -tolerance
+        if worse:
+            regressions.append({
+                'metric': key,
+                'value': values[key],
+                'median': center,
+                'mad': round(mad, 4),
+                'change': round(delta, 4),
+                'change_percent': round(delta / center * 100, 2) if center else None
+            })
+    
+    return regressions
+
+def build_report_context(metrics, now=None):
+    """
+    Build the placeholder values for the maintenance report from collected metrics
+    """
+    now = now or datetime.datetime.now()
+    context = {'DATE': now.strftime('%Y-%m-%d %H:%M:%S')}
+    
+    # Overall status
+    context['STATUS'] = " PASSED" if metrics.get('test', {}).get('total_coverage', 0) >= 80 else " ATTENTION NEEDED"
+    
+    # Dependency status
+    dep_metrics = metrics.get('dependency', {})
+    outdated = dep_metrics.get('outdated_packages', 0)
+    major = dep_metrics.get('major_updates', 0)
+    
+    if major > 0:
+        context['DEPENDENCY_STATUS'] = f"?? {outdated} outdated packages ({major} major updates)"
+    elif outdated > 0:
+        context['DEPENDENCY_STATUS'] = f"? {outdated} outdated packages (minor/patch only)"
+    else:
+        context['DEPENDENCY_STATUS'] = " All dependencies up to date"
+    
+    # Code quality status
+    test_metrics = metrics.get('test', {})
+    coverage = test_metrics.get('total_coverage', 0)
+    
+    if coverage >= 80:
+        context['CODE_QUALITY_STATUS'] = f" {coverage}% test coverage"
+    elif coverage >= 60:
+        context['CODE_QUALITY_STATUS'] = f"? {coverage}% test coverage"
+    else:
+        context['CODE_QUALITY_STATUS'] = f" {coverage}% test coverage"
+    
+    # Build status
+    build_metrics = metrics.get('build', {})
+    build_time = build_metrics.get('total_build_time', 0) / 1000  # Convert to seconds
+    context['BUILD_STATUS'] = f" Completed in {build_time:.2f}s"
+    
+    # Fill in other details
+    context['TEST_COVERAGE'] = str(coverage)
+    context['CODE_SIZE'] = "N/A"  # Would need code to calculate this
+    context['ISSUE_COUNT'] = "0"  # Would need code to calculate this
+    
+    # Dependency details
+    if 'packages' in dep_metrics and dep_metrics['packages']:
+        dep_details = "| Package | Kind | Current | Latest | Update |\n|---------|------|---------|--------|--------|\n"
+        for pkg in dep_metrics['packages'][:10]:  # Show top 10
+            update = pkg.get('update') or ('discontinued' if pkg.get('discontinued') else '-')
+            dep_details += f"| {pkg['name']} | {pkg.get('kind', 'direct')} | {pkg['current']} | {pkg['latest']} | {update} |\n"
+        
+        if len(dep_metrics['packages']) > 10:
+            dep_details += f"\n*...and {len(dep_metrics['packages']) - 10} more packages need updates*"
+        
+        staleness = dep_metrics.get('transitive_staleness', {})
+        if staleness.get('by_direct_dependency'):
+            dep_details += f"\n\n{staleness['stale_packages']} outdated transitive packages, pulled in by: " + ", ".join(
+                f"{entry['name']} ({entry['stale_transitive']})" for entry in staleness['by_direct_dependency'][:5]
+            )
+    else:
+        dep_details = "No outdated dependencies found."
+    context['DEPENDENCY_DETAILS'] = dep_details
+    
+    # Performance metrics
+    context['BUILD_TIME'] = f"{build_time:.2f}s"
+    
+    slowest_phases = build_metrics.get('slowest_phases', [])
+    if slowest_phases:
+        phase_details = "| Phase | Self | Total |\n|-------|------|-------|\n"
+        for phase in slowest_phases:
+            phase_details += f"| {phase['phase']} | {phase['self_ms'] / 1000:.2f}s | {phase['total_ms'] / 1000:.2f}s |\n"
+        critical_path = build_metrics.get('critical_path', [])
+        if critical_path:
+            phase_details += "\nCritical path: " + " > ".join(
+                f"{step['name']} ({step['total_ms'] / 1000:.2f}s)" for step in critical_path
+            )
+    else:
+        phase_details = "No build phase data available."
+    context['BUILD_PHASES'] = phase_details
+    
+    perf_metrics = metrics.get('performance', {})
+    startup_time = perf_metrics.get('time_to_first_frame_ms')
+    peak_memory = perf_metrics.get('peak_memory_mb')
+    
+    if startup_time is not None:
+        startup_status = f"{startup_time:.0f} ms to first frame"
+        if perf_metrics.get('frame_count'):
+            startup_status += (
+                f" (frame build p50/p90/p99: {perf_metrics['frame_build_p50_ms']}/"
+                f"{perf_metrics['frame_build_p90_ms']}/{perf_metrics['frame_build_p99_ms']} ms, "
+                f"{perf_metrics['janky_build_frames'] + perf_metrics['janky_raster_frames']} janky frames)"
+            )
+    else:
+        startup_status = "N/A"
+    
+    context['STARTUP_TIME'] = startup_status
+    context['MEMORY_USAGE'] = f"{peak_memory} MB peak" if peak_memory is not None else "N/A"
+    
+    # Empty sections
+    regressions = metrics.get('regressions', [])
+    if regressions:
+        context['TOP_ISSUES'] = "\n".join(
+            f"- Regression in `{r['metric']}`: {r['value']} vs rolling median {r['median']}"
+            + (f" ({r['change_percent']:+.1f}%)" if r['change_percent'] is not None else "")
+            for r in regressions
+        )
+    else:
+        context['TOP_ISSUES'] = "No major issues found."
+    context['ACTION_ITEMS'] = "- Review test coverage\n- Update dependencies"
+    
+    notes = "This report was automatically generated."
+    if metrics.get('scope'):
+        notes = f"Scope: {metrics['scope']}. {notes}"
+    context['NOTES'] = notes
+    
+    return context
+
+def component_report_metrics(metrics, component):
+    """Metrics for a per-component report: coverage narrowed to that component"""
+    component_coverage = metrics.get('test', {}).get('coverage_by_package', {}).get(component, {})
+    test_metrics = dict(metrics.get('test', {}))
+    test_metrics['total_coverage'] = component_coverage.get('coverage', 0)
+    return dict(metrics, test=test_metrics, scope=f"component {component}")
+
+def generate_reports(reports, template_file):
+    """
+    Render several reports from one template; reports is an iterable of
+    (metrics, output_file) pairs. Returns the number of reports written.
+    """
+    if not os.path.exists(template_file):
+        print(f"Error: Template file {template_file} not found")
+        return 0
+    
+    try:
+        compiled = load_template(template_file)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading template {template_file}: {e}")
+        return 0
+    
+    now = datetime.datetime.now()
+    written = 0
+    for metrics, output_file in reports:
+        try:
+            content, missing = render_template(compiled, build_report_context(metrics, now))
+            if missing:
+                print(f"Warning: No value for {', '.join(missing)} in {template_file}")
+            
+            output_dir = os.path.dirname(output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            with open(output_file, 'w') as f:
+                f.write(content)
+            
+            print(f"Report generated: {output_file}")
+            written += 1
+        except Exception as e:
+            print(f"Error generating report {output_file}: {e}")
+    
+    return written
+
+def generate_report(metrics, template_file, output_file):
+    """
+    Generate a markdown report from collected metrics
+    """
+    return generate_reports([(metrics, output_file)], template_file) == 1
+
+def load_batch_entries(source):
+    """
+    Load the metric snapshots for batch mode from a manifest or a directory.
+
+    A manifest is a JSON list (or {"snapshots": [...]}) of entries with a
+    name, optional branch/commit and the coverage, dependencies,
+    dependency_tree, performance and traces paths of that snapshot; paths
+    are relative to the manifest. A directory is read as one snapshot per
+    subdirectory, using the artifact names the workflows upload.
+    """
+    entries = []
+    
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            snapshot_dir = os.path.join(source, name)
+            if not os.path.isdir(snapshot_dir):
+                continue
+            entry = {'name': name}
+            for key, candidates in BATCH_ARTIFACT_NAMES.items():
+                for candidate in candidates:
+                    path = os.path.join(snapshot_dir, candidate)
+                    if os.path.exists(path):
+                        entry[key] = path
+                        break
+            if any(file.endswith('.trace') or (('timeline' in file or 'trace' in file) and file.endswith('.json'))
+                   for file in os.listdir(snapshot_dir)):
+                entry['traces'] = [snapshot_dir]
+            entries.append(entry)
+        return entries
+    
+    with open(source, 'r') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, dict):
+        manifest = manifest.get('snapshots', [])
+    
+    base_dir = os.path.dirname(os.path.abspath(source))
+    for index, item in enumerate(manifest):
+        entry = {'name': item.get('name') or f"snapshot-{index + 1}"}
+        for key in ('branch', 'commit'):
+            if item.get(key):
+                entry[key] = item[key]
+        for key in BATCH_ARTIFACT_NAMES:
+            if item.get(key):
+                entry[key] = os.path.join(base_dir, item[key])
+        traces = item.get('traces')
+        if traces:
+            entry['traces'] = [os.path.join(base_dir, path) for path in ([traces] if isinstance(traces, str) else traces)]
+        entries.append(entry)
+    
+    return entries
+
+def snapshot_artifacts(entry):
+    """
+    Map a snapshot to (category, artifact key) pairs; equal keys across
+    snapshots refer to the same parsed result
+    """
+    def key(path):
+        return os.path.normpath(os.path.abspath(path))
+    
+    artifacts = {}
+    if entry.get('coverage'):
+        artifacts['test'] = key(entry['coverage'])
+    if entry.get('dependencies'):
+        tree = entry.get('dependency_tree')
+        artifacts['dependency'] = (key(entry['dependencies']), key(tree) if tree else None)
+    if entry.get('performance'):
+        artifacts['build'] = key(entry['performance'])
+    if entry.get('traces'):
+        artifacts['performance'] = tuple(sorted(key(path) for path in entry['traces']))
+    return artifacts
+
+def parse_artifact(category, artifact, component_map=None, top_uncovered=20):
+    """Parse one batch artifact; runs in a worker process"""
+    if category == 'test':
+        return collect_test_metrics(artifact, component_map=component_map, top_uncovered=top_uncovered)
+    if category == 'dependency':
+        return collect_dependency_metrics(*artifact)
+    if category == 'build':
+        return collect_build_metrics(artifact)
+    from .trace_analyzer import collect_trace_metrics
+    return collect_trace_metrics(list(artifact))
+
+def report_file_name(name):
+    """
+    File name of a snapshot's report: path separators become '_' so the
+    report stays inside the output directory. Returns None for names that
+    are still not a plain file name ('', '.', '..').
+    """
+    name = str(name)
+    for separator in {'/', os.sep, os.altsep} - {None}:
+        name = name.replace(separator, '_')
+    if name in ('', '.', '..'):
+        return None
+    return f"{name}.md"
+
+def run_batch(entries, output_dir, template_file=None, component_map=None, top_uncovered=20, max_workers=None):
+    """
+    Collect metrics for many snapshots in one process pool and write a
+    report per snapshot plus a combined metrics.ndjson.
+
+    Every distinct artifact is parsed once, however many snapshots share it.
+    Returns the number of snapshots written.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    snapshots = [(entry, snapshot_artifacts(entry)) for entry in entries]
+    unique = {(category, artifact) for _, artifacts in snapshots for category, artifact in artifacts.items()}
+    print(f"Batch: {len(snapshots)} snapshots, {len(unique)} distinct artifacts")
+    
+    results = {}
+    if unique:
+        with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(unique))) as executor:
+            futures = {
+                task: executor.submit(parse_artifact, task[0], task[1], component_map, top_uncovered)
+                for task in unique
+            }
+            for task, future in futures.items():
+                try:
+                    results[task] = future.result()
+                except Exception as e:
+                    print(f"Error parsing {task[0]} artifact {task[1]}: {e}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    reports = []
+    ndjson_file = os.path.join(output_dir, 'metrics.ndjson')
+    with open(ndjson_file, 'w') as out:
+        for entry, artifacts in snapshots:
+            metrics = {'test': {}, 'dependency': {}, 'build': {}, 'performance': {}}
+            for category, artifact in artifacts.items():
+                metrics[category] = results.get((category, artifact), {})
+            metrics['scope'] = entry['name']
+            
+            record = {
+                'name': entry['name'],
+                'branch': entry.get('branch'),
+                'commit': entry.get('commit'),
+                'metrics': metrics
+            }
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+            
+            report_file = report_file_name(entry['name'])
+            if report_file is None:
+                print(f"Error: snapshot name {entry['name']!r} is not a valid report name, skipping its report")
+                continue
+            reports.append((metrics, os.path.join(output_dir, report_file)))
+    
+    print(f"Metrics for {len(snapshots)} snapshots saved to {ndjson_file}")
+    if template_file:
+        generate_reports(reports, template_file)
+    
+    return len(snapshots)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Collect and process CI/CD metrics')
+    parser.add_argument('--coverage', nargs='+',
+                        help='Path to coverage file (lcov.info or JSON); several LCOV shards are merged first')
+    parser.add_argument('--merged-coverage', default=os.path.join('coverage', 'lcov.info'),
+                        help='Where to write merged coverage when several shards are given')
+    parser.add_argument('--dependencies', help="Path to 'flutter pub outdated --json' output")
+    parser.add_argument('--dependency-tree',
+                        help="Path to 'flutter pub deps' output, used to attribute stale transitive packages")
+    parser.add_argument('--performance', help='Path to build performance file')
+    parser.add_argument('--flamegraph',
+                        help='Write build phases as collapsed stacks for flame graph tools to this file')
+    parser.add_argument('--traces', nargs='+',
+                        help='Flutter timeline/trace JSON files or directories (e.g. performance-data/)')
+    parser.add_argument('--component-map', default=COMPONENT_MAP_PATH,
+                        help='Path to CI component map used for per-component coverage')
+    parser.add_argument('--top-uncovered', type=int, default=20,
+                        help='Number of least-covered files to list (default: 20)')
+    parser.add_argument('--history', default=METRICS_HISTORY_FILE,
+                        help=f'Append-only metrics history used for trend checks (default: {METRICS_HISTORY_FILE})')
+    parser.add_argument('--no-history', action='store_true', help='Do not record or check metrics history')
+    parser.add_argument('--regression-window', type=int, default=20,
+                        help='Number of previous runs in the rolling baseline (default: 20)')
+    parser.add_argument('--regression-threshold', type=float, default=3.0,
+                        help='Regression threshold in scaled MADs from the rolling median (default: 3.0)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with a non-zero status when a regression is detected')
+    parser.add_argument('--template', help='Path to report template file')
+    parser.add_argument('--output', help='Path to output report file')
+    parser.add_argument('--component-reports',
+                        help='Also write one report per coverage component into this directory')
+    parser.add_argument('--batch',
+                        help='Manifest (JSON) or directory of metric snapshots to process in one run')
+    parser.add_argument('--batch-output', default='reports',
+                        help='Directory for batch reports and the combined metrics.ndjson (default: reports)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes used to parse batch artifacts (default: CPU count)')
+    
+    args = parser.parse_args(argv)
+    
+    # Batch mode replaces the single-snapshot flow; history is not recorded
+    if args.batch:
+        if not os.path.exists(args.batch):
+            print(f"Error: Batch source {args.batch} not found")
+            return 1
+        try:
+            entries = load_batch_entries(args.batch)
+        except (OSError, ValueError) as e:
+            print(f"Error reading batch manifest {args.batch}: {e}")
+            return 1
+        run_batch(
+            entries, args.batch_output,
+            template_file=args.template,
+            component_map=load_component_map(args.component_map),
+            top_uncovered=args.top_uncovered,
+            max_workers=args.jobs
+        )
+        return 0
+    
+    metrics = {
+        'test': {},
+        'dependency': {},
+        'build': {},
+        'performance': {}
+    }
+    
+    # Collect metrics
+    coverage_file = None
+    if args.coverage:
+        coverage_file = args.coverage[0]
+        if len(args.coverage) > 1:
+            try:
+                coverage_file = merge_lcov_files(args.coverage, args.merged_coverage)
+                print(f"Merged {len(args.coverage)} coverage shards into {coverage_file}")
+            except Exception as e:
+                print(f"Error merging coverage shards: {e}")
+                coverage_file = None
+    
+    if coverage_file:
+        metrics['test'] = collect_test_metrics(
+            coverage_file,
+            component_map=load_component_map(args.component_map),
+            top_uncovered=args.top_uncovered
+        )
+    
+    if args.dependencies:
+        metrics['dependency'] = collect_dependency_metrics(args.dependencies, args.dependency_tree)
+    
+    if args.performance:
+        metrics['build'] = collect_build_metrics(args.performance)
+        if args.flamegraph and metrics['build']['phase_tree']:
+            write_collapsed_stacks(metrics['build']['phase_tree'], args.flamegraph)
+            print(f"Build phase flame graph stacks written to {args.flamegraph}")
+    
+    if args.traces:
+        from .trace_analyzer import collect_trace_metrics
+        metrics['performance'] = collect_trace_metrics(args.traces)
+    
+    # Compare against the rolling history before recording this run
+    if not args.no_history:
+        commit, branch = current_commit()
+        history = read_recent_history(args.history, limit=args.regression_window * 4)
+        # Branches are only compared with themselves; a branch without enough
+        # runs yet is not checked
+        baseline = [record for record in history if record.get('branch') == branch]
+        
+        # Missing input files yield zeroed metrics; keep those out of the history
+        inputs = {
+            'test': coverage_file if args.coverage else None,
+            'dependency': args.dependencies,
+            'build': args.performance
+        }
+        collected = {
+            category: values for category, values in metrics.items()
+            if inputs.get(category) and os.path.exists(inputs[category])
+        }
+        if metrics['performance'].get('trace_files'):
+            collected['performance'] = metrics['performance']
+        
+        metrics['regressions'] = detect_regressions(
+            flatten_metrics(collected), baseline,
+            window=args.regression_window, threshold=args.regression_threshold
+        )
+        for regression in metrics['regressions']:
+            print(f"Regression detected in {regression['metric']}: {regression['value']} "
+                  f"(rolling median {regression['median']}, MAD {regression['mad']})")
+        
+        try:
+            append_history(collected, args.history, commit, branch)
+        except Exception as e:
+            print(f"Error updating metrics history: {e}")
+    
+    # Generate report
+    if args.template and args.output:
+        reports = [(metrics, args.output)]
+        if args.component_reports:
+            reports.extend(
+                (component_report_metrics(metrics, component), os.path.join(args.component_reports, f"{component}.md"))
+                for component in sorted(metrics['test'].get('coverage_by_package', {}))
+            )
+        generate_reports(reports, args.template)
+    
+    # Save metrics to JSON
+    metrics_dir = os.path.dirname(args.output) if args.output else '.'
+    metrics_file = os.path.join(metrics_dir, 'metrics.json')
+    
+    try:
+        with open(metrics_file, 'w') as f:
+            json.dump({
+                'timestamp': datetime.datetime.now().isoformat(),
+                'metrics': metrics
+            }, f, indent=2)
+        print(f"Metrics saved to {metrics_file}")
+    except Exception as e:
+        print(f"Error saving metrics: {e}")
+    
+    if args.fail_on_regression and metrics.get('regressions'):
+        return 1
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# report_template.py - Compiled {{PLACEHOLDER}} templates for markdown reports
+#
+# A template is split once into literal text and placeholder names, so
+# rendering is a single join over the pieces instead of one full-string
+# replace per placeholder. Compiled templates are cached per file and
+# reused for every report rendered from them.
+
+import os
+import re
+from collections import namedtuple
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}')
+
+# literals has one more entry than keys: text before, between and after placeholders
+CompiledTemplate = namedtuple('CompiledTemplate', ['source', 'literals', 'keys'])
+
+_template_cache = {}
+
+def compile_template(text, source='<string>'):
+    """Split template text into literal chunks and placeholder names"""
+    literals = []
+    keys = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        literals.append(text[position:match.start()])
+        keys.append(match.group(1))
+        position = match.end()
+    literals.append(text[position:])
+    return CompiledTemplate(source, tuple(literals), tuple(keys))
+
+def load_template(template_file):
+    """
+    Compile a template file, reusing the cached compiled form until the
+    file's size or modification time changes
+    """
+    path = os.path.abspath(template_file)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _template_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = compile_template(f.read(), source=template_file)
+    _template_cache[path] = (signature, compiled)
+    return compiled
+
+def render_template(compiled, context):
+    """
+    Render a compiled template from a context dict in one pass.
+
+    Returns (text, missing) where missing lists placeholders that had no
+    value in the context; those are left as-is in the output.
+    """
+    pieces = [compiled.literals[0]]
+    missing = []
+    for key, literal in zip(compiled.keys, compiled.literals[1:]):
+        value = context.get(key)
+        if value is None:
+            if key not in missing:
+                missing.append(key)
+            pieces.append('{{' + key + '}}')
+        else:
+            pieces.append(value if isinstance(value, str) else str(value))
+        pieces.append(literal)
+    return ''.join(pieces), missing
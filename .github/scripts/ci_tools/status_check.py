@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# status_check.py - Latest workflow run status across repositories and branches
+#
+# The workflow list comes from .github/workflows/, and the latest runs of all
+# workflows are read from one /actions/runs page per repository and branch,
+# fetched concurrently. Only workflows missing from that page cost an extra
+# request. --watch re-polls with conditional requests, so unchanged pages
+# are answered with 304 and are not decoded again.
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+from .generate_dashboard import GITHUB_API_URL, WORKFLOWS_DIR, GitHubClient, RunStore
+
+DEFAULT_WATCH_INTERVAL = 30
+DEFAULT_STATUS_WORKERS = 8
+RECENT_RUNS_PAGE_SIZE = 100
+
+COLORS = {'success': '\033[0;32m', 'failure': '\033[0;31m', 'in_progress': '\033[1;33m', 'skipped': '', 'none': ''}
+RESET_COLOR = '\033[0m'
+STATE_LABELS = {
+    'success': 'Success', 'failure': 'Failed', 'in_progress': 'In progress', 'skipped': 'Skipped', 'none': 'No runs found'
+}
+
+WORKFLOW_NAME_PATTERN = re.compile(r'^name:\s*(.+?)\s*$', re.MULTILINE)
+
+def read_workflows(workflows_dir=WORKFLOWS_DIR):
+    """List the workflow files in a workflows directory with their display names"""
+    workflows = []
+    for file_name in sorted(os.listdir(workflows_dir)):
+        if not file_name.endswith(('.yml', '.yaml')):
+            continue
+        with open(os.path.join(workflows_dir, file_name), 'r') as f:
+            match = WORKFLOW_NAME_PATTERN.search(f.read())
+        name = match.group(1).strip('\'"') if match else file_name
+        workflows.append({'file': file_name, 'name': name})
+    return workflows
+
+def detect_repo():
+    """owner/name of the GitHub repository behind the origin remote"""
+    try:
+        url = subprocess.run(
+            ['git', 'config', '--get', 'remote.origin.url'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$', url)
+    return f'{match.group(1)}/{match.group(2)}' if match else None
+
+def github_token():
+    """Token from GITHUB_TOKEN/GH_TOKEN, falling back to the GitHub CLI login"""
+    token = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+    if token:
+        return token
+    try:
+        return subprocess.run(
+            ['gh', 'auth', 'token'], capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def summarize_run(run):
+    """Reduce a workflow run payload to the fields the status check shows"""
+    if not run:
+        return {'state': 'none', 'status': None, 'conclusion': None, 'created_at': None, 'url': None}
+
+    if run.get('status') != 'completed':
+        state = 'in_progress'
+    elif run.get('conclusion') == 'success':
+        state = 'success'
+    elif run.get('conclusion') in ('skipped', 'neutral'):
+        state = 'skipped'
+    else:
+        state = 'failure'
+    return {
+        'state': state,
+        'status': run.get('status'),
+        'conclusion': run.get('conclusion'),
+        'created_at': run.get('created_at'),
+        'url': run.get('html_url')
+    }
+
+def latest_runs(client, repo, branch, workflows, executor):
+    """
+    Latest run of each workflow on a branch (any branch when None).
+
+    One page of recent runs usually covers every workflow; workflows that
+    have not run recently are looked up individually and concurrently.
+    """
+    import urllib.error
+
+    params = {'per_page': RECENT_RUNS_PAGE_SIZE}
+    if branch:
+        params['branch'] = branch
+    data, _ = client.request(f'/repos/{repo}/actions/runs', params, conditional=True)
+
+    latest = {}
+    # Runs are newest first, so the first run seen per workflow file is its latest
+    for run in data.get('workflow_runs', []):
+        file_name = os.path.basename((run.get('path') or '').split('@')[0])
+        latest.setdefault(file_name, run)
+
+    def fetch_latest(file_name):
+        try:
+            runs, _ = client.request(
+                f'/repos/{repo}/actions/workflows/{file_name}/runs', dict(params, per_page=1), conditional=True
+            )
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return next(iter(runs.get('workflow_runs', [])), None)
+
+    missing = [workflow['file'] for workflow in workflows if workflow['file'] not in latest]
+    for file_name, run in zip(missing, executor.map(fetch_latest, missing)):
+        latest[file_name] = run
+
+    return latest
+
+def check_status(client, targets, workflows, max_workers=DEFAULT_STATUS_WORKERS):
+    """
+    Status records for every (repo, branch) target and workflow, fetched
+    concurrently across targets
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    records = []
+    # Separate pools so per-workflow fallbacks never wait on their own target
+    with ThreadPoolExecutor(max_workers=max_workers) as targets_pool, \
+            ThreadPoolExecutor(max_workers=max_workers) as workflows_pool:
+        futures = [
+            targets_pool.submit(latest_runs, client, repo, branch, workflows, workflows_pool)
+            for repo, branch in targets
+        ]
+        for (repo, branch), future in zip(targets, futures):
+            try:
+                latest = future.result()
+            except Exception as e:
+                print(f"Error checking {repo}{f' ({branch})' if branch else ''}: {e}", file=sys.stderr)
+                continue
+            for workflow in workflows:
+                records.append(dict(
+                    {'repo': repo, 'branch': branch, 'workflow': workflow['name'], 'file': workflow['file']},
+                    **summarize_run(latest.get(workflow['file']))
+                ))
+    return records
+
+def format_status(records, color=False):
+    """Human-readable status listing grouped by repository and branch"""
+    lines = []
+    target = None
+    for record in records:
+        if (record['repo'], record['branch']) != target:
+            target = (record['repo'], record['branch'])
+            header = record['repo'] + (f" ({record['branch']})" if record['branch'] else '')
+            lines.append(f"\n{header}\n{'=' * len(header)}")
+
+        label = STATE_LABELS[record['state']]
+        if color and COLORS[record['state']]:
+            label = f"{COLORS[record['state']]}{label}{RESET_COLOR}"
+        lines.append(f"\nWorkflow: {record['workflow']} ({record['file']})")
+        lines.append(f"  Status: {label}")
+        if record['created_at']:
+            lines.append(f"  Last run: {record['created_at']}")
+            lines.append(f"  URL: {record['url']}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show the latest run of every workflow')
+    parser.add_argument('--repo', action='append',
+                        help='Repository as owner/name; repeatable (default: the origin remote)')
+    parser.add_argument('--branch', action='append',
+                        help='Branch to report on; repeatable (default: latest run on any branch)')
+    parser.add_argument('--workflows-dir', default=WORKFLOWS_DIR,
+                        help=f'Directory the workflow list is read from (default: {WORKFLOWS_DIR})')
+    parser.add_argument('--api-url', default=GITHUB_API_URL,
+                        help=f'GitHub REST API base URL (default: {GITHUB_API_URL})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_STATUS_WORKERS,
+                        help=f'Concurrent requests (default: {DEFAULT_STATUS_WORKERS})')
+    parser.add_argument('--json', action='store_true',
+                        help='Print status records as JSON (one line per change with --watch)')
+    parser.add_argument('--watch', action='store_true', help='Keep polling and print when a status changes')
+    parser.add_argument('--interval', type=int, default=DEFAULT_WATCH_INTERVAL,
+                        help=f'Seconds between polls with --watch (default: {DEFAULT_WATCH_INTERVAL})')
+    args = parser.parse_args(argv)
+
+    repos = args.repo or [detect_repo()]
+    if not all(repos):
+        print("Error: Could not determine repository information, pass --repo owner/name")
+        return 1
+
+    try:
+        workflows = read_workflows(args.workflows_dir)
+    except OSError as e:
+        print(f"Error reading workflows from {args.workflows_dir}: {e}")
+        return 1
+
+    targets = [(repo, branch) for repo in repos for branch in (args.branch or [None])]
+    # In-memory validator cache: repeated polls become conditional requests
+    client = GitHubClient(github_token(), repos[0], args.api_url, RunStore(':memory:'), keep_parsed=True)
+    color = sys.stdout.isatty() and not args.json
+
+    previous = None
+    try:
+        while True:
+            records = check_status(client, targets, workflows, max(1, args.workers))
+            if records != previous:
+                if args.json:
+                    print(json.dumps(records, separators=(',', ':')) if args.watch else json.dumps(records, indent=2))
+                else:
+                    if args.watch:
+                        print(f"\n[{time.strftime('%H:%M:%S')}]", end='')
+                    print(format_status(records, color))
+                sys.stdout.flush()
+                previous = records
+            if not args.watch:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,992 @@
+#!/usr/bin/env python3
+# test_helper.py - Script to help with test setup and running
+
+import os
+import re
+import sys
+import json
+import time
+import datetime
+import argparse
+import subprocess
+from pathlib import Path
+
+from .component_matcher import ComponentMatcher
+from .flaky_tests import DEFAULT_FLAKY_THRESHOLD, TEST_RESULTS_FILE
+
+CACHE_DIR = os.path.join('.github', 'cache')
+TEST_DURATIONS_FILE = os.path.join(CACHE_DIR, 'test_durations.json')
+IMPORT_GRAPH_FILE = os.path.join(CACHE_DIR, 'import_graph.json')
+CHANGED_FILES_CACHE = os.path.join(CACHE_DIR, 'changed_files.json')
+DART_SOURCE_ROOTS = ('lib', 'test')
+DART_DIRECTIVE_PATTERN = re.compile(r'^\s*(?:import|export|part)\b(?!\s+of\b)([^;]*);', re.MULTILINE)
+DART_URI_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+# Weight of the newest measurement in the moving average of a test's duration
+DURATION_SMOOTHING = 0.3
+DEFAULT_TEST_DURATION = 10.0
+# Failure messages kept per test; widget test errors can dump whole trees
+MAX_ERROR_LENGTH = 4000
+SLOWEST_TESTS_SHOWN = 10
+
+def load_component_map():
+    """Load the component mapping configuration"""
+    map_path = Path('.github/config/ci_component_map.json')
+    
+    if not map_path.exists():
+        print("Error: CI component map not found at", map_path)
+        return None
+    
+    try:
+        with open(map_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading component map: {e}")
+        return None
+
+def run_git(args):
+    """Run a git command and return its stdout, or None on failure"""
+    result = subprocess.run(['git'] + args, capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        print(f"Error running git {' '.join(args)}: {result.stderr.strip()}")
+        return None
+    
+    return result.stdout
+
+def parse_name_status(output):
+    """
+    Parse 'git diff --name-status -z' output into (status, path, old_path) tuples.
+
+    Renames and copies carry their similarity score in the status (R087) and
+    list the old path before the new one.
+    """
+    tokens = output.split('\0')
+    changes = []
+    i = 0
+    
+    while i < len(tokens) and tokens[i]:
+        status = tokens[i]
+        if status[0] in 'RC':
+            changes.append((status[0], tokens[i + 2], tokens[i + 1]))
+            i += 3
+        else:
+            changes.append((status[0], tokens[i + 1], None))
+            i += 2
+    
+    return changes
+
+def get_changed_file_status(base_branch='main', cache_file=CHANGED_FILES_CACHE, max_entries=20):
+    """
+    List (status, path, old_path) changes between the merge-base with
+    base_branch and HEAD, plus uncommitted changes in the working tree.
+
+    The committed part is cached keyed by the (merge-base sha, head sha) pair.
+    """
+    head = run_git(['rev-parse', 'HEAD'])
+    merge_base = run_git(['merge-base', base_branch, 'HEAD'])
+    if head is None or merge_base is None:
+        return []
+    head, merge_base = head.strip(), merge_base.strip()
+    key = f'{merge_base}..{head}'
+    
+    cache = {}
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+        except Exception as e:
+            print(f"Error loading changed files cache: {e}")
+    
+    if key in cache:
+        changes = [tuple(change) for change in cache[key]]
+    else:
+        output = run_git(['diff', '--name-status', '-z', '-M', merge_base, head])
+        if output is None:
+            return []
+        changes = parse_name_status(output)
+        
+        cache[key] = changes
+        # Entries keep insertion order, so the oldest pairs are dropped first
+        for stale in list(cache)[:-max_entries]:
+            del cache[stale]
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(cache, f)
+        except Exception as e:
+            print(f"Error saving changed files cache: {e}")
+    
+    # Uncommitted changes are cheap to diff and never cached
+    working_tree = run_git(['diff', '--name-status', '-z', '-M', 'HEAD'])
+    if working_tree:
+        changes = changes + parse_name_status(working_tree)
+    
+    return changes
+
+def get_changed_files(base_branch='main'):
+    """Get list of changed files compared to the merge-base with base branch"""
+    try:
+        files = []
+        for status, path, old_path in get_changed_file_status(base_branch):
+            # Both sides of a rename matter: importers of the old path are affected too
+            if old_path:
+                files.append(old_path)
+            files.append(path)
+        
+        return list(dict.fromkeys(files))
+    
+    except Exception as e:
+        print(f"Error checking changed files: {e}")
+        return []
+
+def find_affected_tests(changed_files, component_map, matcher=None):
+    """Find tests that should be run based on changed files"""
+    if matcher is None:
+        matcher = ComponentMatcher(component_map)
+    
+    # Check for critical files first: they run all tests
+    for file in changed_files:
+        if file in matcher.critical_files:
+            print(f"Critical file changed: {file}")
+            return ['test/']  # Run all tests
+    
+    # Map each changed file to its components
+    affected_components = set()
+    for changed_file in changed_files:
+        affected_components |= matcher.match(changed_file)
+    
+    affected_tests = set()
+    for component in affected_components:
+        affected_tests.update(matcher.tests.get(component, []))
+    
+    return sorted(affected_tests)
+
+def read_package_name(pubspec_path='pubspec.yaml'):
+    """Read the Dart package name used by package: imports"""
+    try:
+        with open(pubspec_path, 'r') as f:
+            for line in f:
+                if line.startswith('name:'):
+                    return line.split(':', 1)[1].strip()
+    except OSError as e:
+        print(f"Error reading {pubspec_path}: {e}")
+    return None
+
+def parse_dart_directives(source):
+    """
+    Return the URIs referenced by import, export and part directives.
+
+    Conditional imports contribute every alternative URI; 'part of' is skipped
+    because the owning library's 'part' directive already records the edge.
+    """
+    uris = []
+    for match in DART_DIRECTIVE_PATTERN.finditer(source):
+        for single, double in DART_URI_PATTERN.findall(match.group(1)):
+            uris.append(single or double)
+    return uris
+
+def resolve_dart_uri(uri, source_file, package_name):
+    """Map an import URI to a repo-relative path, or None for SDK/third-party code"""
+    import posixpath
+    
+    if uri.startswith('dart:'):
+        return None
+    if uri.startswith('package:'):
+        package, _, path = uri[len('package:'):].partition('/')
+        return f'lib/{path}' if package == package_name else None
+    if ':' in uri:
+        return None
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_file), uri))
+
+def build_import_graph(roots=DART_SOURCE_ROOTS, cache_file=IMPORT_GRAPH_FILE):
+    """
+    Build {dart file: [files it imports]} for every .dart file under roots.
+
+    Parsed directives are cached by file; a file is only re-read when its
+    mtime or size changed, and only re-parsed when its content hash changed.
+    """
+    import hashlib
+    
+    cache = {}
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f).get('files', {})
+        except Exception as e:
+            print(f"Error loading import graph cache: {e}")
+    
+    package_name = read_package_name()
+    files = {}
+    dirty = False
+    
+    for root in roots:
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                if not name.endswith('.dart'):
+                    continue
+                path = os.path.join(dirpath, name).replace(os.sep, '/')
+                stat = os.stat(path)
+                entry = cache.get(path)
+                
+                if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                    files[path] = entry
+                    continue
+                
+                with open(path, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.sha1(content).hexdigest()
+                
+                if entry and entry['sha1'] == digest:
+                    imports = entry['imports']
+                else:
+                    source = content.decode('utf-8', errors='replace')
+                    imports = sorted({
+                        resolved for resolved in (
+                            resolve_dart_uri(uri, path, package_name)
+                            for uri in parse_dart_directives(source)
+                        ) if resolved
+                    })
+                
+                files[path] = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha1': digest,
+                    'imports': imports
+                }
+                dirty = True
+    
+    if dirty or len(files) != len(cache):
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({'files': files}, f, sort_keys=True)
+        except Exception as e:
+            print(f"Error saving import graph cache: {e}")
+    
+    return {path: entry['imports'] for path, entry in files.items()}
+
+def find_dependent_tests(changed_files, import_graph):
+    """Return the test files that transitively import any of the changed files"""
+    from collections import deque
+    
+    dependents = {}
+    for path, imports in import_graph.items():
+        for imported in imports:
+            dependents.setdefault(imported, []).append(path)
+    
+    seen = set(changed_files)
+    queue = deque(changed_files)
+    while queue:
+        for dependent in dependents.get(queue.popleft(), ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                queue.append(dependent)
+    
+    return sorted(
+        path for path in seen
+        if path.startswith('test/') and path.endswith('_test.dart') and path in import_graph
+    )
+
+def find_affected_tests_by_imports(changed_files, component_map):
+    """
+    Select tests through the Dart import graph.
+
+    Dart files under lib/ and test/ are followed through their reverse
+    dependencies; any other changed file falls back to the component map.
+    """
+    dart_files = [
+        f for f in changed_files
+        if f.endswith('.dart') and f.split('/', 1)[0] in DART_SOURCE_ROOTS
+    ]
+    dart_file_set = set(dart_files)
+    other_files = [f for f in changed_files if f not in dart_file_set]
+    
+    affected_tests = set(find_dependent_tests(dart_files, build_import_graph()))
+    if other_files:
+        fallback = find_affected_tests(other_files, component_map)
+        if 'test/' in fallback:
+            return ['test/']
+        affected_tests.update(fallback)
+    
+    return sorted(affected_tests)
+
+COVERAGE_DIR = 'coverage'
+COVERAGE_SHARD_DIR = os.path.join(COVERAGE_DIR, 'shards')
+COVERAGE_FILE = os.path.join(COVERAGE_DIR, 'lcov.info')
+
+def shard_coverage_path(index):
+    """Coverage file written by the test shard at the given index"""
+    return os.path.join(COVERAGE_SHARD_DIR, f'shard_{index}.info')
+
+def merge_shard_coverage(shard_files, output_file=COVERAGE_FILE):
+    """Merge per-shard LCOV files into a single coverage report"""
+    from .metrics_collector import merge_lcov_files
+    
+    shard_files = [f for f in shard_files if os.path.exists(f)]
+    if not shard_files:
+        print("No coverage shards to merge.")
+        return None
+    
+    try:
+        merge_lcov_files(shard_files, output_file)
+        print(f"Merged {len(shard_files)} coverage shards into {output_file}")
+        return output_file
+    except Exception as e:
+        print(f"Error merging coverage shards: {e}")
+        return None
+
+def normalize_test_paths(test_paths):
+    """
+    Turn component globs into paths flutter test accepts and drop duplicates.
+
+    'test/models/**' becomes the directory 'test/models/', paths that are
+    already covered by a selected directory are dropped, and paths that do not
+    exist are skipped.
+    """
+    converted = []
+    for path in test_paths:
+        if path.endswith('/**'):
+            path = path[:-2]
+        elif os.path.isdir(path) and not path.endswith('/'):
+            path += '/'
+        converted.append(path)
+    
+    candidates = []
+    for path in dict.fromkeys(converted):
+        if not os.path.exists(path):
+            print(f"Skipping missing test path: {path}")
+            continue
+        candidates.append(path)
+    
+    # Shortest paths first so parent directories are seen before their children
+    selected = []
+    for path in sorted(candidates, key=lambda p: (len(p), p)):
+        if any(parent.endswith('/') and path.startswith(parent) for parent in selected):
+            continue
+        selected.append(path)
+    
+    # Keep the caller's ordering for the paths that survive
+    return [path for path in candidates if path in selected]
+
+def build_test_command(paths, shard_file=None, machine=False, plain_name=None):
+    """Build one flutter test command for a list of test paths"""
+    cmd = ['flutter', 'test'] + list(paths)
+    if shard_file:
+        # Each shard keeps its own report instead of overwriting lcov.info
+        cmd.extend(['--coverage', '--coverage-path', shard_file])
+    if machine:
+        cmd.append('--machine')
+    if plain_name:
+        cmd.extend(['--plain-name', plain_name])
+    return cmd
+
+def run_test_shard(label, cmd, output_lock):
+    """Run one test command, streaming its output with a shard prefix"""
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    
+    for line in process.stdout:
+        with output_lock:
+            print(f"[{label}] {line}", end='', flush=True)
+    
+    return process.wait()
+
+def run_machine_shard(label, cmd, output_lock, suite_times=None):
+    """
+    Run one test command with --machine output, parsing the event stream
+    as it arrives. Failures are printed as they happen, as are lines that
+    are not events (tool errors, build output); returns the exit status and
+    the per-test results. suite_times, if given, collects the time span of
+    every test file.
+    """
+    from .flaky_tests import iter_machine_events, iter_test_results
+    
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    
+    def print_text(line):
+        with output_lock:
+            print(f"[{label}] {line}", flush=True)
+    
+    results = []
+    for result in iter_test_results(iter_machine_events(process.stdout, print_text), suite_times):
+        if result['error'] and len(result['error']) > MAX_ERROR_LENGTH:
+            result['error'] = result['error'][:MAX_ERROR_LENGTH] + '\n...'
+        results.append(result)
+        if result['outcome'] in ('failure', 'error'):
+            with output_lock:
+                print(f"[{label}] FAILED {result['name']} ({result['duration_ms'] / 1000:.1f}s)", flush=True)
+                for line in (result['error'] or '').strip().splitlines():
+                    print(f"[{label}]   {line}", flush=True)
+    
+    returncode = process.wait()
+    passed = sum(1 for result in results if result['outcome'] == 'success')
+    with output_lock:
+        print(f"[{label}] {passed}/{len(results)} tests passed", flush=True)
+    return returncode, results
+
+def run_tests_parallel(shards, jobs, results=None, suite_times=None):
+    """
+    Run (label, command) shards concurrently with a bounded worker pool.
+
+    When results is a dict the shards run with --machine output and their
+    per-test results are collected into it by label, and the time span of
+    every test file into suite_times. Returns the failed labels.
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    
+    output_lock = threading.Lock()
+    failed = []
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for label, cmd in shards:
+            if results is not None:
+                future = executor.submit(run_machine_shard, label, cmd, output_lock, suite_times)
+            else:
+                future = executor.submit(run_test_shard, label, cmd, output_lock)
+            futures[future] = label
+        
+        for future, label in futures.items():
+            try:
+                if results is not None:
+                    returncode, results[label] = future.result()
+                else:
+                    returncode = future.result()
+            except Exception as e:
+                print(f"Error running tests for {label}: {e}")
+                returncode = 1
+            
+            if returncode != 0:
+                failed.append(label)
+    
+    return failed
+
+def resolve_flaky_failures(failed, results, flaky, retries=0, quarantine=False, store=None, run_id=None):
+    """
+    Retry or quarantine failures of known-flaky tests.
+
+    A failed shard is cleared when every failing test in it is known flaky
+    and either passes on a retry or is quarantined. Shards that failed
+    without a failing test (e.g. a crash) stay failed. Returns the shards
+    that still fail.
+
+    Resolved failures are updated in results: a test that passed on a retry
+    becomes a success with its retry count, a quarantined one is skipped.
+    """
+    import threading
+    
+    output_lock = threading.Lock()
+    still_failed = []
+    
+    for shard in failed:
+        failures = [result for result in results.get(shard) or [] if result['outcome'] in ('failure', 'error')]
+        # Retrying is pointless when the shard fails on a genuine failure anyway
+        if not failures or any(failure['name'] not in flaky for failure in failures):
+            still_failed.append(shard)
+            continue
+        
+        remaining = []
+        for failure in failures:
+            name = failure['name']
+            passed = False
+            for attempt in range(2, retries + 2):
+                print(f"Retrying flaky test {name} (score {flaky[name]['score']:.2f}, attempt {attempt})")
+                cmd = build_test_command([failure['suite']], machine=True, plain_name=failure['test'])
+                returncode, retry_results = run_machine_shard('retry', cmd, output_lock)
+                if store is not None:
+                    store.add_results(run_id, retry_results, attempt)
+                if returncode == 0:
+                    passed = True
+                    break
+            
+            if passed:
+                failure.update(outcome='success', retries=attempt - 1)
+                continue
+            if quarantine:
+                print(f"Quarantined flaky test failure: {name} (score {flaky[name]['score']:.2f})")
+                failure.update(outcome='skipped', quarantined=True)
+                continue
+            remaining.append(failure)
+        
+        if remaining:
+            still_failed.append(shard)
+    
+    return still_failed
+
+def format_test_summary(results, elapsed=None):
+    """Compact summary of per-test results: totals, failures and the slowest tests"""
+    all_results = [result for path_results in results.values() for result in path_results or []]
+    counts = {}
+    for result in all_results:
+        counts[result['outcome']] = counts.get(result['outcome'], 0) + 1
+    failures = [result for result in all_results if result['outcome'] in ('failure', 'error')]
+    
+    retried = [result for result in all_results if result.get('retries')]
+    quarantined = [result for result in all_results if result.get('quarantined')]
+    
+    totals = f"{len(all_results)} tests: {counts.get('success', 0)} passed, {len(failures)} failed, {counts.get('skipped', 0)} skipped"
+    if retried:
+        totals += f", {len(retried)} passed on retry"
+    if quarantined:
+        totals += f", {len(quarantined)} quarantined"
+    if elapsed is not None:
+        totals += f" in {elapsed:.1f}s"
+    lines = ["", "Test summary", "=" * 12, totals]
+    
+    for title, listed in (("Failures", failures), ("Quarantined flaky failures", quarantined)):
+        if listed:
+            lines.append(f"\n{title}:")
+            for result in listed:
+                message = (result['error'] or '').strip().splitlines()
+                lines.append(f"  {result['name']}" + (f": {message[0]}" if message else ''))
+    
+    if retried:
+        lines.append("\nPassed on retry:")
+        for result in retried:
+            lines.append(f"  {result['name']} ({result['retries']} {'retry' if result['retries'] == 1 else 'retries'})")
+    
+    slowest = sorted(all_results, key=lambda result: result['duration_ms'], reverse=True)[:SLOWEST_TESTS_SHOWN]
+    if slowest:
+        lines.append("\nSlowest tests:")
+        for result in slowest:
+            lines.append(f"  {result['duration_ms'] / 1000:>7.2f}s  {result['name']}")
+    
+    return '\n'.join(lines)
+
+def write_junit_xml(results, junit_file):
+    """
+    Write per-test results as a JUnit XML report, one testsuite per test file.
+
+    Tests that passed on a retry are passing testcases with a flakyFailure
+    element; quarantined failures are skipped with the failure as message.
+    """
+    import xml.etree.ElementTree as ET
+    
+    suites = {}
+    for path_results in results.values():
+        for result in path_results or []:
+            suites.setdefault(result['suite'], []).append(result)
+    
+    root = ET.Element('testsuites')
+    totals = {'tests': 0, 'failures': 0, 'skipped': 0, 'time': 0.0}
+    for suite_name, suite_results in sorted(suites.items()):
+        suite = ET.SubElement(root, 'testsuite', name=suite_name)
+        failures = skipped = 0
+        suite_time = 0.0
+        for result in suite_results:
+            seconds = result['duration_ms'] / 1000
+            suite_time += seconds
+            case = ET.SubElement(suite, 'testcase', classname=suite_name, name=result['test'], time=f"{seconds:.3f}")
+            if result['outcome'] in ('failure', 'error'):
+                failures += 1
+                message = (result['error'] or '').strip()
+                failure = ET.SubElement(case, 'failure', message=message.splitlines()[0] if message else result['outcome'])
+                failure.text = message
+            elif result['outcome'] == 'skipped':
+                skipped += 1
+                element = ET.SubElement(case, 'skipped')
+                if result.get('quarantined'):
+                    message = (result['error'] or '').strip()
+                    element.set('message', 'Quarantined flaky test' + (f": {message.splitlines()[0]}" if message else ''))
+                    element.text = message
+            elif result.get('retries'):
+                message = (result['error'] or '').strip()
+                flaky_failure = ET.SubElement(case, 'flakyFailure', message=message.splitlines()[0] if message else 'failure')
+                flaky_failure.text = message
+        suite.set('tests', str(len(suite_results)))
+        suite.set('failures', str(failures))
+        suite.set('skipped', str(skipped))
+        suite.set('time', f"{suite_time:.3f}")
+        totals['tests'] += len(suite_results)
+        totals['failures'] += failures
+        totals['skipped'] += skipped
+        totals['time'] += suite_time
+    
+    for key, value in totals.items():
+        root.set(key, f"{value:.3f}" if key == 'time' else str(value))
+    
+    try:
+        os.makedirs(os.path.dirname(junit_file) or '.', exist_ok=True)
+        ET.ElementTree(root).write(junit_file, encoding='utf-8', xml_declaration=True)
+        print(f"JUnit report written to {junit_file}")
+    except OSError as e:
+        print(f"Error writing JUnit report {junit_file}: {e}")
+
+def plan_test_batches(test_paths, jobs=1, durations_file=TEST_DURATIONS_FILE):
+    """
+    Group test paths into batches that each run in one flutter test process.
+
+    Every process compiles and starts the test runner again, so there is
+    one batch per worker: all paths together when running sequentially,
+    otherwise the test files split into jobs batches of similar recorded
+    duration.
+    """
+    if jobs <= 1:
+        return [test_paths]
+    
+    test_files = expand_test_files(test_paths)
+    if len(test_files) <= 1:
+        return [test_paths]
+    
+    durations = load_test_durations(durations_file) if durations_file else {}
+    batches = partition_tests(estimate_test_durations(test_files, durations), min(jobs, len(test_files)))
+    return [files for files, _ in batches if files]
+
+def run_tests(test_paths, coverage=True, jobs=1, durations_file=TEST_DURATIONS_FILE,
+              machine=False, junit_file=None,
+              record_results=False, flaky_retries=0, quarantine_flaky=False,
+              results_file=TEST_RESULTS_FILE, flaky_threshold=DEFAULT_FLAKY_THRESHOLD):
+    """
+    Run Flutter tests for given paths in one flutter test process, or in
+    up to jobs processes at a time.
+
+    Without machine output a single process writes straight to the
+    console, and parallel batches stream theirs with a batch prefix.
+
+    With machine (implied by junit_file and the options below) the tests
+    run with --machine output, parsed as it arrives: failures are printed as they
+    happen, a summary with the slowest tests is printed at the end and
+    junit_file, if given, receives a JUnit XML report. The time each test
+    file took is then recorded in durations_file so later runs can balance
+    shards; pass None to skip recording.
+
+    With record_results, flaky_retries or quarantine_flaky every test
+    outcome is also stored in results_file.
+    Failing tests whose flakiness score reaches flaky_threshold are retried
+    up to flaky_retries times, and with quarantine_flaky their failures do
+    not fail the run.
+    """
+    test_paths = normalize_test_paths(test_paths)
+    if not test_paths:
+        print("No tests to run.")
+        return True
+    
+    track_outcomes = bool(record_results or flaky_retries or quarantine_flaky)
+    machine = bool(machine or junit_file or track_outcomes)
+    run_start = time.monotonic()
+    shards = []
+    shard_files = []
+    
+    if coverage:
+        os.makedirs(COVERAGE_SHARD_DIR, exist_ok=True)
+    
+    batches = plan_test_batches(test_paths, jobs, durations_file)
+    for index, paths in enumerate(batches):
+        shard_file = None
+        if coverage:
+            shard_file = shard_coverage_path(index)
+            if os.path.exists(shard_file):
+                os.remove(shard_file)
+            shard_files.append(shard_file)
+        label = f'batch {index + 1}' if len(batches) > 1 else 'tests'
+        shards.append((label, build_test_command(paths, shard_file, machine)))
+    
+    results = {} if machine else None
+    suite_times = {}
+    
+    if len(shards) > 1:
+        print(f"Running {len(shards)} test batches with {jobs} workers")
+        failed = run_tests_parallel(shards, jobs, results, suite_times)
+    else:
+        import threading
+        
+        label, cmd = shards[0]
+        print(f"Running tests for: {test_paths[0]}" if len(test_paths) == 1 else f"Running {len(test_paths)} test paths")
+        if machine:
+            returncode, results[label] = run_machine_shard(label, cmd, threading.Lock(), suite_times)
+        else:
+            returncode = subprocess.run(cmd).returncode
+        failed = [label] if returncode != 0 else []
+    
+    if track_outcomes:
+        from .flaky_tests import TestResultStore, code_revision, load_flaky_tests
+        
+        flaky = {}
+        if failed and (flaky_retries or quarantine_flaky):
+            flaky = load_flaky_tests(results_file, flaky_threshold)
+        
+        store = TestResultStore(results_file)
+        try:
+            run_id = store.start_run(code_revision(), label='test_helper')
+            for path_results in results.values():
+                store.add_results(run_id, path_results or [])
+            if flaky:
+                failed = resolve_flaky_failures(
+                    failed, results, flaky, flaky_retries, quarantine_flaky, store, run_id
+                )
+        finally:
+            store.close()
+    
+    if machine:
+        print(format_test_summary(results, time.monotonic() - run_start))
+        if junit_file:
+            write_junit_xml(results, junit_file)
+    
+    for label in failed:
+        print("Tests failed" + (f" in {label}" if len(shards) > 1 else ""))
+    success = not failed
+    
+    measured = {path: (last - first) / 1000 for path, (first, last) in suite_times.items()}
+    if durations_file and measured:
+        record_test_durations(measured, durations_file)
+    
+    if coverage:
+        merge_shard_coverage(shard_files)
+    
+    return success
+
+def load_test_durations(durations_file=TEST_DURATIONS_FILE):
+    """Load the recorded test durations, keyed by test path"""
+    if not os.path.exists(durations_file):
+        return {}
+    
+    try:
+        with open(durations_file, 'r') as f:
+            return json.load(f).get('durations', {})
+    except Exception as e:
+        print(f"Error loading test durations: {e}")
+        return {}
+
+def record_test_durations(measured, durations_file=TEST_DURATIONS_FILE):
+    """Fold new measurements into the duration history as a moving average"""
+    durations = load_test_durations(durations_file)
+    now = datetime.datetime.now().isoformat()
+    
+    for path, elapsed in measured.items():
+        entry = durations.get(path)
+        if entry:
+            seconds = (1 - DURATION_SMOOTHING) * entry['seconds'] + DURATION_SMOOTHING * elapsed
+            runs = entry.get('runs', 0) + 1
+        else:
+            seconds, runs = elapsed, 1
+        durations[path] = {'seconds': round(seconds, 3), 'runs': runs, 'updated_at': now}
+    
+    try:
+        os.makedirs(os.path.dirname(durations_file) or '.', exist_ok=True)
+        with open(durations_file, 'w') as f:
+            json.dump({'durations': durations}, f, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"Error saving test durations: {e}")
+
+def expand_test_files(test_paths):
+    """Expand test directories into the individual *_test.dart files they contain"""
+    files = []
+    
+    for path in normalize_test_paths(test_paths):
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name).replace(os.sep, '/')
+                    for name in names if name.endswith('_test.dart')
+                )
+        else:
+            files.append(path)
+    
+    return sorted(dict.fromkeys(files))
+
+def estimate_test_durations(test_files, durations):
+    """
+    Estimate how long each test file takes.
+
+    A file's own history wins; otherwise the closest recorded parent directory
+    is split evenly between its files, and unknown files get the median of the
+    known durations.
+    """
+    known = sorted(entry['seconds'] for entry in durations.values())
+    fallback = known[len(known) // 2] if known else DEFAULT_TEST_DURATION
+    
+    # Number of selected files under every directory prefix
+    files_per_dir = {}
+    for test_file in test_files:
+        parts = test_file.split('/')[:-1]
+        for i in range(1, len(parts) + 1):
+            directory = '/'.join(parts[:i]) + '/'
+            files_per_dir[directory] = files_per_dir.get(directory, 0) + 1
+    
+    estimates = {}
+    for test_file in test_files:
+        if test_file in durations:
+            estimates[test_file] = durations[test_file]['seconds']
+            continue
+        
+        estimates[test_file] = fallback
+        parts = test_file.split('/')[:-1]
+        for i in range(len(parts), 0, -1):
+            directory = '/'.join(parts[:i]) + '/'
+            if directory in durations:
+                estimates[test_file] = durations[directory]['seconds'] / files_per_dir[directory]
+                break
+    
+    return estimates
+
+def partition_tests(estimates, shard_count):
+    """
+    Split tests into shards of roughly equal duration using
+    longest-processing-time-first bin packing
+    """
+    import heapq
+    
+    shards = [[] for _ in range(shard_count)]
+    # (total seconds, shard index) so ties go to the lowest shard
+    loads = [(0.0, index) for index in range(shard_count)]
+    
+    for test_file, seconds in sorted(estimates.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(loads)
+        shards[index].append(test_file)
+        heapq.heappush(loads, (load + seconds, index))
+    
+    totals = {index: load for load, index in loads}
+    return [(sorted(shards[index]), totals[index]) for index in range(shard_count)]
+
+def parse_shard(value):
+    """Parse a 1-based 'i/N' shard selector"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected i/N")
+    
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected 1 <= i <= N")
+    
+    return index, count
+
+def setup_test_environment():
+    """Set up the test environment (create .env file, etc.)"""
+    os.makedirs('assets', exist_ok=True)
+    
+    # Create a simple .env file for tests
+    with open('assets/.env', 'w') as f:
+        f.write("SUPABASE_URL=https://example.supabase.co\n")
+        f.write("SUPABASE_ANON_KEY=example_key\n")
+        f.write("ENV=test\n")
+        f.write("LOG_INFO=true\n")
+        f.write("LOG_WARNING=true\n")
+        f.write("LOG_ERROR=true\n")
+    
+    print("Test environment set up successfully")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Flutter test helper script')
+    parser.add_argument('--all', action='store_true', help='Run all tests')
+    parser.add_argument('--component', help='Run tests for specific component')
+    parser.add_argument('--changed', action='store_true', help='Run tests based on changed files')
+    parser.add_argument('--import-graph', action='store_true',
+                        help='With --changed, select tests through the Dart import graph')
+    parser.add_argument('--base', default='main', help='Base branch for comparison (default: main)')
+    parser.add_argument('--no-coverage', action='store_true', help='Disable coverage reporting')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of flutter test processes to run concurrently (default: 1)')
+    parser.add_argument('--shard', type=parse_shard,
+                        help='Run only shard i of N, balanced by recorded test durations (e.g. 2/4)')
+    parser.add_argument('--durations-file', default=TEST_DURATIONS_FILE,
+                        help=f'Test duration history used for sharding, updated by --machine runs '
+                             f'(default: {TEST_DURATIONS_FILE})')
+    parser.add_argument('--machine', action='store_true',
+                        help='Parse flutter test --machine output: live failures, a per-test summary '
+                             'and recorded test durations for --jobs and --shard')
+    parser.add_argument('--junit-xml', metavar='FILE',
+                        help='Write a JUnit XML report of the test results (implies --machine)')
+    parser.add_argument('--record-results', action='store_true',
+                        help='Run with --machine output and store every test outcome for flakiness scoring')
+    parser.add_argument('--retry-flaky', type=int, default=0, metavar='N',
+                        help='Retry failing tests that are known to be flaky up to N times')
+    parser.add_argument('--quarantine-flaky', action='store_true',
+                        help='Do not fail the run on failures of known-flaky tests')
+    parser.add_argument('--flaky-threshold', type=float, default=DEFAULT_FLAKY_THRESHOLD,
+                        help=f'Flakiness score from which a test counts as flaky (default: {DEFAULT_FLAKY_THRESHOLD})')
+    parser.add_argument('--results-file', default=TEST_RESULTS_FILE,
+                        help=f'Test outcome history (default: {TEST_RESULTS_FILE})')
+    parser.add_argument('--setup-env', action='store_true', help='Set up test environment')
+    
+    args = parser.parse_args(argv)
+    
+    # Load component map
+    component_map = load_component_map()
+    if not component_map:
+        sys.exit(1)
+    
+    # Set up environment if requested
+    if args.setup_env:
+        setup_test_environment()
+    
+    # Determine which tests to run
+    test_paths = []
+    
+    if args.all:
+        test_paths = ['test/']
+    
+    elif args.component:
+        component = args.component.lower()
+        if component in component_map.get('test_mapping', {}):
+            test_paths = component_map['test_mapping'][component]
+        else:
+            print(f"Unknown component: {component}")
+            print("Available components:", list(component_map.get('test_mapping', {}).keys()))
+            sys.exit(1)
+    
+    elif args.changed:
+        changed_files = get_changed_files(args.base)
+        print("Changed files:")
+        for f in changed_files:
+            print(f"  {f}")
+        
+        if args.import_graph:
+            test_paths = find_affected_tests_by_imports(changed_files, component_map)
+        else:
+            test_paths = find_affected_tests(changed_files, component_map)
+    
+    else:
+        # No test selection provided
+        parser.print_help()
+        sys.exit(1)
+    
+    if args.shard:
+        shard_index, shard_count = args.shard
+        estimates = estimate_test_durations(
+            expand_test_files(test_paths),
+            load_test_durations(args.durations_file)
+        )
+        shards = partition_tests(estimates, shard_count)
+        
+        print(f"\nShard plan ({shard_count} shards):")
+        for index, (files, seconds) in enumerate(shards, start=1):
+            print(f"  {index}/{shard_count}: {len(files)} files, ~{seconds:.1f}s")
+        
+        test_paths = shards[shard_index - 1][0]
+    
+    print("\nTests to run:")
+    for path in test_paths:
+        print(f"  {path}")
+    
+    # Run the tests
+    success = run_tests(
+        test_paths,
+        coverage=not args.no_coverage,
+        jobs=max(1, args.jobs),
+        durations_file=args.durations_file,
+        machine=args.machine,
+        junit_file=args.junit_xml,
+        record_results=args.record_results,
+        flaky_retries=max(0, args.retry_flaky),
+        quarantine_flaky=args.quarantine_flaky,
+        results_file=args.results_file,
+        flaky_threshold=args.flaky_threshold
+    )
+    
+    if not success:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# trace_analyzer.py - Streaming analysis of Flutter timeline/trace files
+#
+# Timeline exports from `flutter run --profile --trace-startup` and DevTools
+# use the Chrome trace-event format and can be hundreds of MB, so events are
+# decoded one at a time from a sliding buffer instead of loading the file.
+
+import os
+import json
+import math
+from array import array
+
+CHUNK_SIZE = 1 << 20
+# 60 Hz frame budget
+FRAME_BUDGET_MS = 1000 / 60
+
+# Candidate frame events in priority order. Several of them nest inside each
+# other (Frame wraps Animator::BeginFrame, GPURasterizer::Draw wraps
+# Rasterizer::DoDraw), so only the first name present in a trace is counted.
+BUILD_EVENTS = ('Frame', 'Animator::BeginFrame', 'BUILD')
+RASTER_EVENTS = ('GPURasterizer::Draw', 'Rasterizer::DoDraw', 'Rasterizer::Draw', 'RASTER')
+MEMORY_ARG_HINTS = ('rss', 'heap', 'memory', 'capacity')
+
+class TraceParseError(ValueError):
+    pass
+
+def iter_trace_events(trace_file, chunk_size=CHUNK_SIZE):
+    """
+    Yield trace events from a Chrome trace-event JSON file incrementally.
+
+    Accepts both the object form ({"traceEvents": [...]}) and the bare array
+    form. Only the current event and one read chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(trace_file, 'r', encoding='utf-8', errors='replace') as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+
+        def fill():
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+        # Locate the opening bracket of the event array
+        position = 0
+        while True:
+            stripped = buffer.lstrip()
+            if stripped.startswith('['):
+                position = len(buffer) - len(stripped) + 1
+                break
+            key = buffer.find('"traceEvents"')
+            if key != -1:
+                bracket = buffer.find('[', key)
+                if bracket != -1:
+                    position = bracket + 1
+                    break
+            if eof:
+                raise TraceParseError(f"No trace events found in {trace_file}")
+            fill()
+
+        while True:
+            # Skip separators between events
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                buffer, position = buffer[position:], 0
+                fill()
+
+            if position >= len(buffer) or buffer[position] == ']':
+                return
+
+            try:
+                event, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise TraceParseError(f"Truncated or malformed trace event in {trace_file}")
+                buffer, position = buffer[position:], 0
+                fill()
+                continue
+
+            yield event
+            position = end
+            if position > chunk_size:
+                buffer, position = buffer[position:], 0
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted sequence"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+def analyze_trace(trace_file, frame_budget_ms=FRAME_BUDGET_MS):
+    """
+    Extract frame build/raster durations, time to first frame and peak memory
+    from one trace file in a single streaming pass
+    """
+    # Durations per candidate event name; one name per phase is picked at the end
+    build_ms = {name: array('d') for name in BUILD_EVENTS}
+    raster_ms = {name: array('d') for name in RASTER_EVENTS}
+    first_raster_end = {}
+    open_slices = {}
+    first_ts = None
+    peak_memory = 0
+
+    for event in iter_trace_events(trace_file):
+        if not isinstance(event, dict):
+            continue
+
+        phase = event.get('ph')
+        name = event.get('name')
+        ts = event.get('ts')
+        if isinstance(ts, (int, float)) and (first_ts is None or ts < first_ts):
+            first_ts = ts
+
+        duration = None
+        if phase == 'X':
+            duration = event.get('dur')
+        elif phase == 'B':
+            # Slices nest per thread; E events close the innermost open slice
+            open_slices.setdefault((event.get('pid'), event.get('tid')), []).append((name, ts))
+            continue
+        elif phase == 'E':
+            stack = open_slices.get((event.get('pid'), event.get('tid')))
+            if stack:
+                name, start = stack.pop()
+                if isinstance(ts, (int, float)) and isinstance(start, (int, float)):
+                    duration = ts - start
+        elif phase == 'C':
+            for arg, value in (event.get('args') or {}).items():
+                if isinstance(value, (int, float)) and any(hint in arg.lower() for hint in MEMORY_ARG_HINTS):
+                    peak_memory = max(peak_memory, value)
+            continue
+
+        if duration is None:
+            continue
+
+        if name in build_ms:
+            build_ms[name].append(duration / 1000)
+        elif name in raster_ms:
+            raster_ms[name].append(duration / 1000)
+            end = ts + duration if phase == 'X' else ts
+            if name not in first_raster_end or end < first_raster_end[name]:
+                first_raster_end[name] = end
+
+    build_event = next((name for name in BUILD_EVENTS if build_ms[name]), None)
+    raster_event = next((name for name in RASTER_EVENTS if raster_ms[name]), None)
+    raster_end = first_raster_end.get(raster_event)
+
+    return {
+        'build_ms': build_ms[build_event] if build_event else array('d'),
+        'raster_ms': raster_ms[raster_event] if raster_event else array('d'),
+        'build_event': build_event,
+        'raster_event': raster_event,
+        'time_to_first_frame_ms': (raster_end - first_ts) / 1000
+        if raster_end is not None and first_ts is not None else None,
+        'peak_memory_bytes': peak_memory,
+        'frame_budget_ms': frame_budget_ms
+    }
+
+def read_startup_info(startup_file):
+    """Read time-to-first-frame from the start_up_info.json written by --trace-startup"""
+    try:
+        with open(startup_file, 'r') as f:
+            data = json.load(f)
+        micros = data.get('timeToFirstFrameRasterizedMicros') or data.get('timeToFirstFrameMicros')
+        return micros / 1000 if micros else None
+    except Exception as e:
+        print(f"Error reading startup info {startup_file}: {e}")
+        return None
+
+def find_trace_files(paths):
+    """
+    Expand files and directories into trace files: *.trace files and JSON
+    files named like a timeline or trace export, plus start_up_info.json
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.endswith('.trace') or (
+                        name.endswith('.json')
+                        and ('timeline' in name or 'trace' in name or name == 'start_up_info.json')
+                    )
+                )
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            print(f"Warning: Trace file {path} not found")
+    return files
+
+def collect_trace_metrics(paths, frame_budget_ms=FRAME_BUDGET_MS):
+    """
+    Analyse timeline/trace files and summarise startup, frame and memory metrics
+    """
+    metrics = {
+        "time_to_first_frame_ms": None,
+        "frame_count": 0,
+        "frame_build_p50_ms": 0.0,
+        "frame_build_p90_ms": 0.0,
+        "frame_build_p99_ms": 0.0,
+        "frame_raster_p50_ms": 0.0,
+        "frame_raster_p90_ms": 0.0,
+        "frame_raster_p99_ms": 0.0,
+        "janky_build_frames": 0,
+        "janky_raster_frames": 0,
+        "peak_memory_mb": None,
+        "trace_files": []
+    }
+
+    build_ms = array('d')
+    raster_ms = array('d')
+    startup_info_ms = None
+    trace_startup_ms = []
+    peak_memory = 0
+
+    for trace_file in find_trace_files(paths):
+        if os.path.basename(trace_file) == 'start_up_info.json':
+            startup_info_ms = read_startup_info(trace_file)
+            continue
+
+        try:
+            result = analyze_trace(trace_file, frame_budget_ms)
+        except (OSError, TraceParseError) as e:
+            print(f"Error analysing trace {trace_file}: {e}")
+            continue
+
+        metrics["trace_files"].append(trace_file)
+        build_ms.extend(result['build_ms'])
+        raster_ms.extend(result['raster_ms'])
+        peak_memory = max(peak_memory, result['peak_memory_bytes'])
+        if result['time_to_first_frame_ms'] is not None:
+            trace_startup_ms.append(result['time_to_first_frame_ms'])
+
+    build_sorted = sorted(build_ms)
+    raster_sorted = sorted(raster_ms)
+    for label, values in (('build', build_sorted), ('raster', raster_sorted)):
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            metrics[f"frame_{label}_{name}_ms"] = round(percentile(values, fraction), 3)
+
+    metrics["frame_count"] = max(len(build_sorted), len(raster_sorted))
+    metrics["janky_build_frames"] = sum(1 for value in build_sorted if value > frame_budget_ms)
+    metrics["janky_raster_frames"] = sum(1 for value in raster_sorted if value > frame_budget_ms)
+    # start_up_info.json is measured by the engine; traces are the fallback
+    if startup_info_ms is not None:
+        metrics["time_to_first_frame_ms"] = round(startup_info_ms, 2)
+    elif trace_startup_ms:
+        metrics["time_to_first_frame_ms"] = round(min(trace_startup_ms), 2)
+    if peak_memory:
+        metrics["peak_memory_mb"] = round(peak_memory / (1024 * 1024), 1)
+
+    return metrics
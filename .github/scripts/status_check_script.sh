@@ -36,41 +36,12 @@ fi
 
 echo -e "\n${GREEN}Checking workflow status...${NC}"
 
-# List of workflows to check
-WORKFLOWS=("basic_test.yml" "build.yml" "pr_validation.yml" "release.yml" "scheduled_maintenance.yml")
-
-for workflow in "${WORKFLOWS[@]}"; do
-    echo -e "\n${YELLOW}Workflow: ${workflow}${NC}"
-    
-    if [ "$HAS_GH" = true ]; then
-        # Use GitHub CLI to get the latest run
-        latest_run=$(gh api -X GET repos/$REPO_OWNER/$REPO_NAME/actions/workflows/$workflow/runs -f per_page=1)
-        
-        # Extract status and conclusion
-        status=$(echo $latest_run | jq -r '.workflow_runs[0].status')
-        conclusion=$(echo $latest_run | jq -r '.workflow_runs[0].conclusion')
-        created_at=$(echo $latest_run | jq -r '.workflow_runs[0].created_at')
-        url=$(echo $latest_run | jq -r '.workflow_runs[0].html_url')
-        
-        if [ "$status" = "null" ]; then
-            echo "  Status: No runs found"
-        else
-            if [ "$status" = "completed" ]; then
-                if [ "$conclusion" = "success" ]; then
-                    echo -e "  Status: ${GREEN}Success${NC}"
-                else
-                    echo -e "  Status: ${RED}Failed${NC}"
-                fi
-            else
-                echo -e "  Status: ${YELLOW}In progress${NC}"
-            fi
-            echo "  Last run: $created_at"
-            echo "  URL: $url"
-        fi
-    else
-        echo "  Install GitHub CLI for workflow status information"
-    fi
-done
+# Latest run of every workflow in .github/workflows, fetched in one pass
+if command -v python3 &> /dev/null; then
+    python3 "$(dirname "$0")/ci.py" status --repo "$REPO_OWNER/$REPO_NAME"
+else
+    echo -e "${RED}python3 not found in PATH; it is needed for workflow status information${NC}"
+fi
 
 echo -e "\n${GREEN}Checking repository metrics...${NC}"
 